@@ -2,31 +2,17 @@
 # Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 9 Nov 22
 
+import collections
+import itertools
+
+from overlap_graph import overlap, overlap_graph
+from search_algorithms.fasta_loader import iter_fasta_chunks
+
 # Opens and reads genome from 'fasta' file
-def readFASTA(filename):
-    genome = ''
-    with open(filename, 'r') as f:
-        for line in f:
-            # ignore header line with genome information
-            if not line[0] == '>':
-                genome += line.rstrip()
-    return genome
+from search_algorithms.fasta_loader import read_genome as readFASTA
 
 # Opens and reads genome from 'fastq' file
-def readFASTQ(filename):
-    sequences = []
-    qualities = []
-    with open(filename) as fh:
-        while True:
-            fh.readline()  # skip name line
-            seq = fh.readline().rstrip()  # read base sequence
-            fh.readline()  # skip placeholder line
-            qual = fh.readline().rstrip() # base quality line
-            if len(seq) == 0:
-                break
-            sequences.append(seq)
-            qualities.append(qual)
-    return sequences, qualities
+from search_algorithms.fastq_reader import read_fastq as readFASTQ
 
 def editDistance(p, t): # pattern, text
     m, n = len(p), len(t)
@@ -40,22 +26,161 @@ def editDistance(p, t): # pattern, text
                 dp[i][j-1] + 1,)
     return min(dp[m])
 
-def overlap(a, b, min_length=3):
-    """ Return length of longest suffix of 'a' matching
-        a prefix of 'b' that is at least 'min_length'
-        characters long.  If no such overlap exists,
-        return 0. """
-    start = 0  # start all the way at the left
-    while True:
-        start = a.find(b[:min_length], start)  # look for b's prefix in a
-        if start == -1:  # no more occurrences to right
-            return 0
-        # found occurrence; check for full suffix/prefix match
-        if b.startswith(a[start:]):
-            return len(a)-start
-        start += 1  # move just past previous match
-
-def overlap_all_pairs(reads, k, map={}): # k is the minimum overlap length
+# Bit-parallel edit distance (Myers 1999, Hyyro 2001) with the same semantics as editDistance:
+# p must match entirely, anywhere in t. Each text character updates the whole DP column at once
+# through the vertical delta bit vectors Pv/Mv; Python ints hold patterns longer than 64 bases.
+def editDistanceMyers(p, t): # pattern, text
+    """ Return (minimum edit distance of p against any substring of t,
+        list of end offsets j such that some t[i:j] reaches it) """
+    m = len(p)
+    if m == 0:
+        return 0, list(range(len(t)+1))
+    mask = (1 << m) - 1
+    high = 1 << (m-1) # bit of the last pattern row
+    peq = {} # bitmask of pattern positions holding each character
+    for i, c in enumerate(p):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    pv, mv = mask, 0 # column 0 holds 0, 1, ..., m: all vertical deltas +1
+    score = best = m
+    ends = [0]
+    for j, c in enumerate(t, 1):
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) & mask # row 0 is free (0) in every column, so no carry-in
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        if score < best:
+            best, ends = score, [j]
+        elif score == best:
+            ends.append(j)
+    return best, ends
+
+# Banded edit distance using Ukkonen's cut-off: only rows up to the last one whose value is still
+# within max_dist are computed in each column, and larger values are capped at max_dist + 1
+def editDistanceBanded(p, t, max_dist): # pattern, text, maximum distance of interest
+    """ Return (minimum edit distance, end offsets reaching it) like
+        editDistanceMyers if the minimum is at most max_dist, else (None, []) """
+    m = len(p)
+    cap = max_dist + 1
+    col = [min(i, cap) for i in range(m+1)]
+    last = min(max_dist, m) # last row whose value is <= max_dist
+    best, ends = None, []
+    if last == m:
+        best, ends = m, [0]
+    for j, c in enumerate(t, 1):
+        diag, up = 0, 0 # previous column's and this column's value in the row above
+        top = min(last+1, m)
+        for i in range(1, top+1):
+            left = col[i]
+            if p[i-1] == c:
+                v = diag
+            else:
+                v = min(diag, up, left) + 1
+                if v > cap:
+                    v = cap
+            diag, up = left, v
+            col[i] = v
+        last = top
+        while col[last] > max_dist:
+            last -= 1
+        if last == m:
+            if best is None or col[m] < best:
+                best, ends = col[m], [j]
+            elif col[m] == best:
+                ends.append(j)
+    return best, ends
+
+# Rolling-column edit distance: only the current DP column (m+1 values) is kept, so t can be
+# any iterable of text chunks, e.g. iter_fasta_chunks(filename)
+def _streamColumns(p, chunks):
+    """ Yield (j, t[j-1], dp[m][j]) for every text position j >= 1 """
+    m = len(p)
+    col = list(range(m+1)) # column 0
+    j = 0
+    for chunk in chunks:
+        for c in chunk:
+            j += 1
+            diag = col[0]
+            for i in range(1, m+1):
+                left = col[i]
+                col[i] = min(diag + (p[i-1] != c), left + 1, col[i-1] + 1)
+                diag = left
+            yield j, c, col[m]
+
+def editDistanceStream(p, chunks): # pattern, iterable of text chunks
+    """ Return (minimum edit distance, end offsets reaching it) like
+        editDistanceMyers, using O(len(p)) memory """
+    best, ends = len(p), [0]
+    for j, _, score in _streamColumns(p, chunks):
+        if score < best:
+            best, ends = score, [j]
+        elif score == best:
+            ends.append(j)
+    return best, ends
+
+def editDistanceAlign(p, chunks): # pattern, iterable of text chunks
+    """ Return (distance, start, end, cigar) for the leftmost best hit of p
+        in the streamed text, so that p aligns to t[start:end]. Only the
+        last 2*len(p) text characters are buffered while streaming, and the
+        alignment is recovered with Hirschberg's linear-space algorithm. """
+    m = len(p)
+    recent = collections.deque(maxlen=2*m) # a best hit never spans more than 2m characters
+    best, end, window = m, 0, ''
+    for j, c, score in _streamColumns(p, chunks):
+        recent.append(c)
+        if score < best:
+            best, end = score, j
+            window = ''.join(recent)[-(m+best):] if m+best > 0 else ''
+    # Free start: aligning the reversed strings from the hit end finds the shortest span reaching best
+    last = _lastRow(p[::-1], window[::-1])
+    length = last.index(best)
+    ops = []
+    _hirschberg(p, window[len(window)-length:], ops)
+    return best, end-length, end, _cigar(ops)
+
+def _lastRow(a, b):
+    """ Last row of the global edit distance DP of a against every prefix of b """
+    prev = list(range(len(b)+1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j-1] + (ca != cb), prev[j] + 1, cur[j-1] + 1)
+        prev = cur
+    return prev
+
+def _hirschberg(a, b, ops):
+    """ Append the operations of an optimal global alignment of a (query)
+        to b (reference) to ops: 'M' aligned, 'I' only in a, 'D' only in b """
+    if len(a) == 0:
+        ops.extend('D' * len(b))
+    elif len(b) == 0:
+        ops.extend('I' * len(a))
+    elif len(a) == 1:
+        k = max(b.find(a), 0) # align to an equal character if there is one
+        ops.extend('D' * k + 'M' + 'D' * (len(b)-k-1))
+    else:
+        mid = len(a) // 2
+        left = _lastRow(a[:mid], b)
+        right = _lastRow(a[mid:][::-1], b[::-1])
+        split = min(range(len(b)+1), key=lambda j: left[j] + right[len(b)-j])
+        _hirschberg(a[:mid], b[:split], ops)
+        _hirschberg(a[mid:], b[split:], ops)
+
+def _cigar(ops):
+    """ Run-length encode alignment operations as a CIGAR string """
+    return ''.join(str(len(list(run))) + op for op, run in itertools.groupby(ops))
+
+def overlap_all_pairs(reads, k, map=None): # k is the minimum overlap length
+    if map is None:
+        map = {}
     def get_kmers(read, k):
         res = set()
         for i in range(0, len(read)-k+1):
@@ -64,7 +189,7 @@ def overlap_all_pairs(reads, k, map={}): # k is the minimum overlap length
     for read in reads:
         kmers = get_kmers(read, k)
         for kmer in kmers:
-            if not kmer in map.keys():
+            if not kmer in map:
                 map[kmer] = set()
             map[kmer].add(read)
     pairs = []
@@ -76,16 +201,22 @@ def overlap_all_pairs(reads, k, map={}): # k is the minimum overlap length
                 pairs.append((head, tail))
     return pairs
 
-genome = readFASTA("chr1.GRCh38.excerpt.fasta")
-p1 = "GCTGATCGATCGTACG"
-p2 = "GATTTACCAGATTGAG"
+def main():
+    genome = readFASTA("chr1.GRCh38.excerpt.fasta")
+    p1 = "GCTGATCGATCGTACG"
+    p2 = "GATTTACCAGATTGAG"
+
+    print("Reading chr1.GRCh38.excerpt.fasta...")
+    print("Pattern:",p1,"\nEdit Distance:",(editDistanceMyers(p1, genome)[0]))
+    print("\nPattern:",p2,"\nEdit Distance:",(editDistanceMyers(p2, genome)[0]))
+    distance, start, end, cigar = editDistanceAlign(p2, iter_fasta_chunks("chr1.GRCh38.excerpt.fasta"))
+    print("Best hit:",str(start)+"-"+str(end),"\nAlignment (CIGAR):",cigar)
 
-print("Reading chr1.GRCh38.excerpt.fasta...")
-print("Pattern:",p1,"\nEdit Distance:",(editDistance(p1, genome)))
-print("\nPattern:",p2,"\nEdit Distance:",(editDistance(p2, genome)))
+    reads, _ = readFASTQ("ERR266411_1.for_asm.fastq")
 
-reads, _ = readFASTQ("ERR266411_1.for_asm.fastq")
+    print("\nReading ERR266411_1.for_asm.fastq...")
+    graph = overlap_graph(reads, 30)
+    print("Pairs (Edges in Graph):",str(graph.num_edges()),"\nNodes w outgoing edges:",str(sum(1 for i in range(len(graph)) if graph.successors(i)[0])))
 
-print("\nReading ERR266411_1.for_asm.fastq...")
-pairs = overlap_all_pairs(reads, 30)
-print("Pairs (Edges in Graph):",str(len(pairs)),"\nNodes w outgoing edges:",str((len(set(pair[0] for pair in pairs)))))
+if __name__ == '__main__':
+    main()
@@ -2,38 +2,15 @@
 # Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 9 Nov 22
 
+import heapq
 import itertools
 
-# Opens and reads 'fastq' file
-def readFASTQ(filename):
-    sequences = []
-    qualities = []
-    with open(filename) as fh:
-        while True:
-            fh.readline()  # skip name line
-            seq = fh.readline().rstrip()  # read base sequence
-            fh.readline()  # skip placeholder line
-            qual = fh.readline().rstrip() # base quality line
-            if len(seq) == 0:
-                break
-            sequences.append(seq)
-            qualities.append(qual)
-    return sequences, qualities
+import numpy as np
 
-def overlap(a, b, min_length=3):
-    """ Return length of longest suffix of 'a' matching
-        a prefix of 'b' that is at least 'min_length'
-        characters long.  If no such overlap exists,
-        return 0. """
-    start = 0  # start all the way at the left
-    while True:
-        start = a.find(b[:min_length], start)  # look for b's suffx in a
-        if start == -1:  # no more occurrences to right
-            return 0
-        # found occurrence; check for full suffix/prefix match
-        if b.startswith(a[start:]):
-            return len(a)-start
-        start += 1  # move just past previous match
+from overlap_graph import overlap, overlap_graph
+
+# Opens and reads 'fastq' file
+from search_algorithms.fastq_reader import read_fastq as readFASTQ
 
 def scss(ss):
     """ Returns shortest common superstring of given
@@ -54,6 +31,49 @@ def scss(ss):
             shortest_cnt += 1
     return shortest_sup, shortest_cnt  # return shortest
 
+# Held-Karp dynamic programming over subsets instead of trying every permutation: O(2^n * n^2).
+# best[mask, i] is the largest total overlap of an ordering of the strings in mask that starts
+# with string i, and count[mask, i] the number of such orderings, so shortest_cnt still counts
+# the optimal permutations exactly like scss (int64 counts are exact for up to 20 strings).
+def scss_dp(ss):
+    """ Returns shortest common superstring of given
+        strings and the number of permutations giving it, like scss """
+    n = len(ss)
+    if n == 0:
+        return None, 1
+    ov = np.zeros((n, n), dtype=np.int64) # pairwise overlaps
+    for i, j in itertools.permutations(range(n), 2):
+        ov[i, j] = overlap(ss[i], ss[j], min_length=1)
+    full = (1 << n) - 1
+    best = np.zeros((full+1, n), dtype=np.int64)
+    count = np.zeros((full+1, n), dtype=np.int64)
+    bits = np.arange(n)
+    for mask in range(1, full+1):
+        idx = bits[(mask >> bits) & 1 == 1] # strings in mask
+        if len(idx) == 1:
+            count[mask, idx[0]] = 1
+            continue
+        rest = mask ^ (1 << idx) # mask without each possible first string
+        total = ov[idx[:, None], idx] + best[rest[:, None], idx] # first i, then an ordering starting at j
+        np.fill_diagonal(total, -1)
+        top = total.max(axis=1)
+        best[mask, idx] = top
+        count[mask, idx] = ((total == top[:, None]) * count[rest[:, None], idx]).sum(axis=1)
+    # Rebuild the first optimal permutation in itertools.permutations order, as scss returns it
+    top = best[full].max()
+    i = int(np.flatnonzero(best[full] == top)[0])
+    shortest_cnt = int(count[full][best[full] == top].sum())
+    shortest_sup = ss[i]
+    mask = full
+    while mask != 1 << i:
+        rest = mask ^ (1 << i)
+        for j in range(n):
+            if rest >> j & 1 and ov[i, j] + best[rest, j] == best[mask, i]:
+                break
+        shortest_sup += ss[j][ov[i, j]:]
+        mask, i = rest, j
+    return shortest_sup, shortest_cnt
+
 def pick_max_overlap(reads, k):
     best_a, best_b, best_len = None, None, 0
     for a, b in itertools.permutations(reads, 2):
@@ -72,14 +92,70 @@ def greedy_scss(reads, k):
         reads.append(a + b[olen:])
     return ''.join(reads) # append all non-overlaps onto eachother and return the concatenated string
 
-# shortest_common, frequency = scss(['CCT', 'CTT', 'TGC', 'TGG', 'GAT', 'ATT'])
-# print(len(shortest_common))
-# print(frequency)
+# Greedy SCS without rescanning every pair on each merge: overlaps are computed once with a k-mer
+# index and kept in a max-heap. Merged contigs get new ids, so entries that mention a merged id are
+# skipped when popped, and a union-find over ids maps the reads' k-mers to the contig holding them.
+# Ties are broken by id, i.e. by position in the list greedy_scss keeps, so the result is the same.
+def greedy_scss_heap(reads, k):
+    contigs = dict(enumerate(reads)) # live contig id -> sequence
+    parent = list(range(len(reads))) # union-find over read and contig ids
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    kmer_reads = {} # k-mer -> reads containing it; a contig's k-mers are exactly its reads' k-mers
+    prefixes = {} # prefix k-mer -> live contigs starting with it
+    for i, read in enumerate(reads):
+        for j in range(len(read)-k+1):
+            kmer_reads.setdefault(read[j:j+k], set()).add(i)
+        prefixes.setdefault(read[:k], set()).add(i)
+    max_len = max([len(read) for read in reads] + [0]) # no overlap can be longer than this
+    heap = [(-olen, a, b) for a, b, olen in overlap_graph(reads, k).edges()]
+    heapq.heapify(heap)
+    while heap:
+        olen, a, b = heapq.heappop(heap)
+        if a not in contigs or b not in contigs:
+            continue # stale entry: one side was merged already
+        x = len(parent)
+        seq_a, seq_b = contigs.pop(a), contigs.pop(b)
+        merged = seq_a + seq_b[-olen:]
+        parent.append(x)
+        parent[a] = parent[b] = x
+        prefixes[seq_a[:k]].discard(a)
+        prefixes[seq_b[:k]].discard(b)
+        max_len = max(max_len, len(merged))
+        # x -> y: y's prefix k-mer occurs in the last max_len characters of x
+        targets = set()
+        for j in range(max(0, len(merged)-max_len), len(merged)-k+1):
+            targets.update(prefixes.get(merged[j:j+k], ()))
+        # y -> x: y contains x's prefix k-mer
+        sources = set(find(r) for r in kmer_reads.get(merged[:k], ()))
+        sources.discard(x)
+        for y in targets:
+            length = overlap(merged, contigs[y], min_length=k)
+            if length > 0:
+                heapq.heappush(heap, (-length, x, y))
+        for y in sources:
+            length = overlap(contigs[y], merged, min_length=k)
+            if length > 0:
+                heapq.heappush(heap, (-length, y, x))
+        prefixes.setdefault(merged[:k], set()).add(x)
+        contigs[x] = merged
+    return ''.join(contigs.values()) # dicts keep insertion order, i.e. greedy_scss's list order
+
+def main():
+    # shortest_common, frequency = scss_dp(['CCT', 'CTT', 'TGC', 'TGG', 'GAT', 'ATT'])
+    # print(len(shortest_common))
+    # print(frequency)
+
+    reads, _ = readFASTQ('mysteryvirus.fastq')
+    print("Reading file...")
+    genome = greedy_scss_heap(reads, 30)
+    print("Genome:",genome)
+    print("Length of genome:",str(len(genome)))
+    print("A count:",str(genome.count('A')))
+    print("B count:",str(genome.count('T')))
 
-reads, _ = readFASTQ('mysteryvirus.fastq')
-print("Reading file...")
-genome = greedy_scss(reads, 30)
-print("Genome:",genome)
-print("Length of genome:",str(len(genome)))
-print("A count:",str(genome.count('A')))
-print("B count:",str(genome.count('T')))
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# Builds the overlap graph of a set of reads as compact CSR arrays
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+from array import array
+
+def overlap(a, b, min_length=3):
+    """ Return length of longest suffix of 'a' matching
+        a prefix of 'b' that is at least 'min_length'
+        characters long.  If no such overlap exists,
+        return 0. """
+    start = 0  # start all the way at the left
+    while True:
+        start = a.find(b[:min_length], start)  # look for b's prefix in a
+        if start == -1:  # no more occurrences to right
+            return 0
+        # found occurrence; check for full suffix/prefix match
+        if b.startswith(a[start:]):
+            return len(a)-start
+        start += 1  # move just past previous match
+
+class OverlapGraph(object):
+    """ Overlap graph in compressed sparse row form: the edges leaving read
+        i are targets[indptr[i]:indptr[i+1]], with the overlap length of
+        each edge in the same slice of lengths. Reads are numbered by their
+        position in the input list. """
+
+    def __init__(self, indptr, targets, lengths):
+        self.indptr = indptr
+        self.targets = targets
+        self.lengths = lengths
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def successors(self, i):
+        """ Return (targets, overlap lengths) of the edges leaving read i """
+        lo, hi = self.indptr[i], self.indptr[i+1]
+        return self.targets[lo:hi], self.lengths[lo:hi]
+
+    def edges(self):
+        """ Yield (source, target, overlap length) for every edge """
+        for i in range(len(self)):
+            for e in range(self.indptr[i], self.indptr[i+1]):
+                yield i, self.targets[e], self.lengths[e]
+
+def overlap_graph(reads, k):
+    """ Build the graph with an edge a -> b whenever the longest suffix of
+        reads[a] matching a prefix of reads[b] is at least k long. Only the
+        last k-mer of each read is indexed: a suffix/prefix overlap of length
+        L means b[L-k:L] equals the last k-mer of a, so every prefix length of
+        b is one dictionary lookup, and candidates are checked with endswith. """
+    suffixes = {}  # last k-mer -> ids of the reads ending with it
+    for i, read in enumerate(reads):
+        if len(read) >= k:
+            suffixes.setdefault(read[-k:], []).append(i)
+    incoming = [[] for _ in reads]  # (source, length) of the edges entering each read
+    for b, read in enumerate(reads):
+        seen = set()
+        for length in range(len(read), k-1, -1):  # longest overlap first
+            heads = suffixes.get(read[length-k:length])
+            if heads is None:
+                continue
+            prefix = read[:length]
+            for a in heads:
+                if a != b and a not in seen and len(reads[a]) >= length and reads[a].endswith(prefix):
+                    seen.add(a)
+                    incoming[b].append((a, length))
+    # Transpose into CSR arrays keyed by source read
+    indptr = array('l', [0] * (len(reads)+1))
+    for edges in incoming:
+        for a, _ in edges:
+            indptr[a+1] += 1
+    for i in range(len(reads)):
+        indptr[i+1] += indptr[i]
+    fill = array('l', indptr[:-1])
+    targets = array('l', [0] * indptr[-1])
+    lengths = array('l', [0] * indptr[-1])
+    for b, edges in enumerate(incoming):
+        for a, length in edges:
+            targets[fill[a]] = b
+            lengths[fill[a]] = length
+            fill[a] += 1
+    return OverlapGraph(indptr, targets, lengths)
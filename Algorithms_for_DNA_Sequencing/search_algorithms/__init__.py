@@ -0,0 +1,63 @@
+# Exact and approximate matching, indexing and sequence I/O for the Algorithms for DNA Sequencing scripts
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+#
+# Submodules are imported on first attribute access (PEP 562), so
+#     from search_algorithms import BoyerMoore
+# only loads bm_preproc, and NumPy is only imported by the names that need it.
+# The scripts run with `python -m search_algorithms.dna_naiveBM` (or
+# dna_naive, dna_sequencing) from the Algorithms_for_DNA_Sequencing directory.
+
+import importlib
+import os
+
+# public name -> submodule defining it. Functions named like their module
+# (boyer_moore_fast, parallel_search, reverse_complement, shift_add) are
+# left out, because importing the submodule binds that name on the package
+# to the module; import them from the submodule instead.
+_EXPORTS = {
+    'AhoCorasick': 'aho_corasick',
+    'approximate_match_batch': 'batch_match',
+    'BoyerMoore': 'bm_preproc',
+    'BoyerMooreFast': 'boyer_moore_fast',
+    'FastaGenome': 'fasta_loader',
+    'load_fasta': 'fasta_loader',
+    'read_genome': 'fasta_loader',
+    'iter_fasta_chunks': 'fasta_loader',
+    'QualityStats': 'fastq_qc',
+    'quality_histogram': 'fastq_qc',
+    'qc_report': 'fastq_qc',
+    'FastqRecord': 'fastq_reader',
+    'iter_fastq': 'fastq_reader',
+    'iter_fastq_batches': 'fastq_reader',
+    'iter_fastq_blocks': 'fastq_reader',
+    'read_fastq': 'fastq_reader',
+    'FMIndex': 'fm_index',
+    'Index': 'index_search',
+    'approximate_match_index': 'index_search',
+    'KmerIndex': 'kmer_index',
+    'kmer_code': 'kmer_index',
+    'naive': 'matchers',
+    'naive_mm': 'matchers',
+    'boyer_moore': 'matchers',
+    'PackedSequence': 'packed_sequence',
+    'reverse_complement_batch': 'reverse_complement',
+    'hamming_mm': 'shift_add',
+    'strand_match': 'strand_search',
+}
+
+__all__ = sorted(_EXPORTS) + ['data_path']
+
+def data_path(filename):
+    """ Return the path of a data file shipped next to these modules """
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module('.' + module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
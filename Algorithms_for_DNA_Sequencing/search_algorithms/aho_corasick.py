@@ -0,0 +1,81 @@
+# Aho-Corasick automaton: finds many patterns (primers, adapters, probes) in one scan of the text
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+from array import array
+from collections import deque
+
+ALPHABET = 'ACGTN'
+SIGMA = len(ALPHABET) + 1  # last code stands for any other character and leads back to the root
+OTHER = len(ALPHABET)
+# bytes -> automaton code; lowercase (soft-masked) bases match like uppercase ones
+CODE_TABLE = bytes(ALPHABET.index(chr(b).upper()) if chr(b).upper() in ALPHABET else OTHER for b in range(256))
+
+class AhoCorasick(object):
+    """ Automaton over the ACGTN alphabet whose transitions are stored in
+        one flat array: delta[state * SIGMA + code] is the next state """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.lengths = [len(p) for p in self.patterns]
+        delta = array('l', [-1] * SIGMA)  # trie edges; -1 = missing
+        own = [[]]  # pattern ids ending exactly at each state
+        for pid, p in enumerate(self.patterns):
+            if len(p) == 0:
+                raise ValueError("empty pattern")
+            state = 0
+            for c in p.encode() if isinstance(p, str) else p:
+                code = CODE_TABLE[c]
+                if code == OTHER:
+                    raise ValueError("pattern %d contains a character outside %s" % (pid, ALPHABET))
+                nxt = delta[state*SIGMA + code]
+                if nxt == -1:
+                    nxt = len(own)
+                    delta[state*SIGMA + code] = nxt
+                    delta.extend([-1] * SIGMA)
+                    own.append([])
+                state = nxt
+            own[state].append(pid)
+        # Breadth-first pass: set failure links and turn missing edges into
+        # the failure state's transitions, giving a complete automaton
+        states = len(own)
+        fail = array('l', [0] * states)
+        self.out_link = array('l', [-1] * states)  # nearest proper suffix state with output
+        queue = deque()
+        for code in range(SIGMA):
+            nxt = delta[code]
+            if nxt == -1:
+                delta[code] = 0
+            else:
+                queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            self.out_link[state] = f if own[f] else self.out_link[f]
+            for code in range(SIGMA):
+                nxt = delta[state*SIGMA + code]
+                if nxt == -1:
+                    delta[state*SIGMA + code] = delta[f*SIGMA + code]
+                else:
+                    fail[nxt] = delta[f*SIGMA + code]
+                    queue.append(nxt)
+        self.delta = delta
+        self.own = own
+        self.has_output = bytearray(1 if own[s] or self.out_link[s] != -1 else 0 for s in range(states))
+
+    def __len__(self):
+        return len(self.own)
+
+    def search(self, t):
+        """ Scan t once and yield (pattern_id, offset) for every occurrence
+            of every pattern, in order of the occurrence's end position """
+        codes = (t.encode() if isinstance(t, str) else bytes(t)).translate(CODE_TABLE)
+        delta, has_output, own, out_link, lengths = self.delta, self.has_output, self.own, self.out_link, self.lengths
+        state = 0
+        for i, code in enumerate(codes):
+            state = delta[state*SIGMA + code]
+            if has_output[state]:
+                s = state
+                while s != -1:
+                    for pid in own[s]:
+                        yield pid, i - lengths[pid] + 1
+                    s = out_link[s]
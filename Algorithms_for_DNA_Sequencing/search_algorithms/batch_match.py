@@ -0,0 +1,56 @@
+# Batch approximate matching of many reads against one reference through a shared k-mer index
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import numpy as np
+
+from .kmer_index import kmer_code
+
+VERIFY_BLOCK = 4096  # candidate alignments verified per NumPy operation
+
+def count_mismatches(genome, read, offsets):
+    """ Return the number of mismatches of read (uint8 array) at each of
+        the given offsets of genome (uint8 array) """
+    counts = np.empty(len(offsets), dtype=np.int64)
+    cols = np.arange(len(read))
+    for i in range(0, len(offsets), VERIFY_BLOCK):
+        block = offsets[i:i+VERIFY_BLOCK]
+        windows = genome[block[:, None] + cols]  # one row per candidate alignment
+        counts[i:i+VERIFY_BLOCK] = np.count_nonzero(windows != read, axis=1)
+    return counts
+
+def approximate_match_batch(reads, index, t, n, cache_size=1 << 20):
+    """ Map every read to text t allowing up to n mismatches, using the
+        pigeonhole principle over a prebuilt KmerIndex of t. reads is an
+        iterable of sequences (numbered from 0) or (read_id, sequence)
+        pairs, e.g. the sequences returned by readFastq. Seed lookups are
+        cached across reads. Yields (read_id, offset, mismatches) for every
+        hit, in increasing offset order per read. """
+    genome = np.frombuffer(t.encode() if isinstance(t, str) else t, dtype=np.uint8)
+    seeds = {}  # seed k-mer -> offsets array from the index
+    for read_id, p in enumerate(reads):
+        if isinstance(p, tuple):
+            read_id, p = p
+        segment_length = len(p) // (n+1)
+        if segment_length < index.k:
+            continue  # no segment is long enough to be looked up exactly
+        candidates = []
+        for i in range(n+1):
+            start = i * segment_length
+            seed = p[start:start+index.k]
+            hits = seeds.get(seed)
+            if hits is None:
+                if len(seeds) >= cache_size:
+                    seeds.clear()
+                code = kmer_code(seed)
+                hits = np.zeros(0, dtype=np.int64) if code is None else index.lookup(code).astype(np.int64)
+                seeds[seed] = hits
+            candidates.append(hits - start)
+        offsets = np.unique(np.concatenate(candidates))  # sorted, each alignment once
+        offsets = offsets[(offsets >= 0) & (offsets + len(p) <= len(genome))]
+        if len(offsets) == 0:
+            continue
+        read = np.frombuffer(p.encode() if isinstance(p, str) else p, dtype=np.uint8)
+        mismatches = count_mismatches(genome, read, offsets)
+        keep = mismatches <= n
+        for offset, mm in zip(offsets[keep].tolist(), mismatches[keep].tolist()):
+            yield read_id, offset, mm
@@ -0,0 +1,145 @@
+# Non-interactive benchmark of the matchers: wall time, peak memory, alignments and comparisons as CSV or JSON
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+#
+# Run from the Algorithms_for_DNA_Sequencing directory, e.g.
+#     python -m search_algorithms.benchmark --sizes 100000 800000 --lengths 8 24 64 --mismatches 0 1 2 -o bench.csv
+# Every (genome, pattern length, mismatch budget) combination produces one row
+# per matcher; exact matchers only run with 0 mismatches. Index construction
+# (and the bytes copy of the genome boyer_moore_fast searches)
+# is reported in its own rows (pattern_length and mismatches empty).
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from . import data_path
+from .bm_preproc import BoyerMoore
+from .boyer_moore_fast import boyer_moore_fast
+from .fasta_loader import read_genome
+from .fm_index import FMIndex
+from .index_search import approximate_match_index
+from .kmer_index import KmerIndex
+from .matchers import naive, naive_mm, boyer_moore
+from .shift_add import shift_add, hamming_mm
+
+FIELDS = ['source', 'genome_size', 'pattern_length', 'mismatches', 'matcher', 'occurrences',
+          'alignments', 'comparisons', 'seconds', 'peak_bytes']
+
+KMER_LENGTH = 8  # k of the KmerIndex used by approximate_match_index
+
+def _approximate_match_index(p, t, n, indexes):
+    occurrences, hits = approximate_match_index(p, t, n, indexes['KmerIndex'])
+    return sorted(occurrences), hits, None  # alignments = index hits verified
+
+# name -> (function(p, t, n, indexes) returning (occurrences, alignments, comparisons),
+#          exact only, index it needs or None)
+MATCHERS = {
+    'naive': (lambda p, t, n, ix: naive(p, t), True, None),
+    'naive_mm': (lambda p, t, n, ix: naive_mm(p, t, n), False, None),
+    'shift_add': (lambda p, t, n, ix: shift_add(p, t, n), False, None),
+    'hamming_mm': (lambda p, t, n, ix: hamming_mm(p, t, n), False, None),
+    'boyer_moore': (lambda p, t, n, ix: boyer_moore(p, BoyerMoore(p), t), True, None),
+    'boyer_moore_fast': (lambda p, t, n, ix: boyer_moore_fast(p, ix['bytes']), True, 'bytes'),
+    'fm_index': (lambda p, t, n, ix: ix['FMIndex'].match(p), True, 'FMIndex'),
+    'approximate_match_index': (_approximate_match_index, False, 'KmerIndex'),
+}
+
+INDEX_BUILDERS = {
+    'bytes': str.encode,  # genome encoded once for boyer_moore_fast
+    'FMIndex': FMIndex,
+    'KmerIndex': lambda t: KmerIndex.build(t, KMER_LENGTH),
+}
+
+def measure(fn, memory=True):
+    """ Call fn() and return (result, seconds, peak bytes allocated). Time
+        is taken from an untraced call; with memory, fn runs a second time
+        under tracemalloc, which would otherwise distort the timing. """
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+def genomes(sizes, synthetic=True, seed=0):
+    """ Yield (source, genome) pairs: prefixes of the chr1 excerpt of every
+        size it can provide, and random ACGT genomes of every size """
+    chr1 = read_genome(data_path('chr1.GRCh38.excerpt.fasta'))
+    rng = random.Random(seed)
+    for size in sizes:
+        if size <= len(chr1):
+            yield 'chr1', chr1[:size]
+        if synthetic:
+            yield 'synthetic', ''.join(rng.choices('ACGT', k=size))
+
+def run(sizes, lengths, mismatches, matchers=None, synthetic=True, memory=True, seed=0):
+    """ Yield one result row (dict with FIELDS) per index build and per
+        matcher run over the sweep """
+    matchers = matchers or list(MATCHERS)
+    rng = random.Random(seed)
+    for source, t in genomes(sizes, synthetic, seed):
+        needed = set(MATCHERS[name][2] for name in matchers) - {None}
+        indexes = {}
+        for name in sorted(needed):
+            indexes[name], seconds, peak = measure(lambda: INDEX_BUILDERS[name](t), memory)
+            yield dict.fromkeys(FIELDS, None) | dict(source=source, genome_size=len(t), matcher=name + '.build',
+                                                     seconds=seconds, peak_bytes=peak)
+        for length in lengths:
+            if length > len(t):
+                continue
+            offset = rng.randrange(len(t) - length + 1)
+            p = t[offset:offset+length]  # pattern taken from the genome, so at least one hit
+            for n in mismatches:
+                for name in matchers:
+                    function, exact, index = MATCHERS[name]
+                    if exact and n > 0:
+                        continue
+                    if index == 'KmerIndex' and length // (n + 1) < KMER_LENGTH:
+                        continue  # pigeonhole segments shorter than the indexed k-mers
+                    (occurrences, alignments, comparisons), seconds, peak = measure(
+                        lambda: function(p, t, n, indexes), memory)
+                    yield dict(source=source, genome_size=len(t), pattern_length=length, mismatches=n,
+                               matcher=name, occurrences=len(occurrences), alignments=alignments,
+                               comparisons=comparisons, seconds=seconds, peak_bytes=peak)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DNA search algorithms")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 800000], help="genome sizes")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[8, 24, 64], help="pattern lengths")
+    parser.add_argument('--mismatches', type=int, nargs='+', default=[0, 1, 2], help="mismatch budgets")
+    parser.add_argument('--matchers', nargs='+', choices=list(MATCHERS), help="matchers to run (default: all)")
+    parser.add_argument('--no-synthetic', action='store_true', help="only use the chr1 excerpt")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+    rows = run(args.sizes, args.lengths, args.mismatches, args.matchers,
+               not args.no_synthetic, not args.no_memory, args.seed)
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(out, FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                out.flush()  # rows appear as the sweep progresses
+        else:
+            json.dump(list(rows), out, indent=1)
+            out.write('\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == '__main__':
+    main()
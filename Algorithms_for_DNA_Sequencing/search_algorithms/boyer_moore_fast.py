@@ -0,0 +1,88 @@
+# Boyer-Moore matching driven by one flat shift table, with optional alignment/comparison counting
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+from array import array
+
+from .bm_preproc import good_suffix_table
+
+class BoyerMooreFast(object):
+    """ Boyer-Moore preprocessing folded into a single table: for a mismatch
+        at pattern offset j against text byte c, shift[j*256 + c] is the
+        larger of the bad character and (weak) good suffix shifts, so the
+        scan does one array lookup instead of two rule evaluations """
+
+    def __init__(self, p):
+        self.p = p.encode() if isinstance(p, str) else bytes(p)
+        m = len(self.p)
+        if m > 1:
+            _, big_l, small_l_prime = good_suffix_table(self.p.decode('latin-1'))
+            self.match_shift = max(1, m - small_l_prime[1])
+        else:
+            big_l = small_l_prime = [0] * m
+            self.match_shift = 1
+        self.shift = array('l', [0] * (m * 256))
+        last = [-1] * 256  # last offset of each byte in p[:j]
+        for j in range(m):
+            if j == m - 1:
+                good_suffix = 0
+            elif big_l[j+1] > 0:
+                good_suffix = m - big_l[j+1]
+            else:
+                good_suffix = m - small_l_prime[j+1]
+            base = j * 256
+            for c in range(256):
+                self.shift[base + c] = max(1, j - last[c], good_suffix)
+            last[self.p[j]] = j
+
+def boyer_moore_fast(p, t, p_bm=None, count=False):
+    """ Boyer-Moore matching of p in t (bytes, bytearray or str). Returns
+        (occurrences, alignments, comparisons); the two counters are only
+        computed, and otherwise None, when count=True, in which case they
+        equal those of boyer_moore. A str t is encoded, copying the whole
+        text, on every call: encode a genome once when searching it for
+        many patterns. """
+    if p_bm is None:
+        p_bm = BoyerMooreFast(p)
+    if isinstance(t, str):
+        t = t.encode()
+    if count:
+        return _boyer_moore_counting(p_bm, t)
+    p, shift, match_shift = p_bm.p, p_bm.shift, p_bm.match_shift
+    m = len(p)
+    occurrences = []
+    i = 0
+    last = len(t) - m
+    while i <= last:
+        j = m - 1
+        while j >= 0 and p[j] == t[i+j]:
+            j -= 1
+        if j < 0:
+            occurrences.append(i)
+            i += match_shift
+        else:
+            i += shift[j*256 + t[i+j]]
+    return occurrences, None, None
+
+def _boyer_moore_counting(p_bm, t):
+    """ The scan loop of boyer_moore_fast with instrumentation """
+    p, shift, match_shift = p_bm.p, p_bm.shift, p_bm.match_shift
+    m = len(p)
+    occurrences = []
+    alignments = 0
+    comparisons = 0
+    i = 0
+    last = len(t) - m
+    while i <= last:
+        alignments += 1
+        j = m - 1
+        while j >= 0:
+            comparisons += 1
+            if p[j] != t[i+j]:
+                break
+            j -= 1
+        if j < 0:
+            occurrences.append(i)
+            i += match_shift
+        else:
+            i += shift[j*256 + t[i+j]]
+    return occurrences, alignments, comparisons
@@ -2,39 +2,10 @@
 # Part of the 'Genomic Data Science' Specialization | Course 3: Algorithms for DNA Sequencing
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 25 Oct 22
 
-# Takes a DNA string and returns its reverse complement
-def reverseComplement(s):
-    complement = {'A': 'T', 'C': 'G', 'G': 'C', 'T': 'A', 'N': 'N'}
-    t = ''
-    for base in s:
-        t = complement[base] + t
-    return t
-
-# Parses a DNA reference genome from a file in the FASTA format
-def readGenome(filename):
-    genome = ''
-    with open(filename, 'r') as f:
-        for line in f:
-            # ignore header line with genome information
-            if not line[0] == '>':
-                genome += line.rstrip()
-    return genome
+import os
 
-# Parses the read and quality strings from a FASTQ file containing sequencing reads
-def readFastq(filename):
-    sequences = []
-    qualities = []
-    with open(filename) as fh:
-        while True:
-            fh.readline()  # skip name line
-            seq = fh.readline().rstrip()  # read base sequence
-            fh.readline()  # skip placeholder line
-            qual = fh.readline().rstrip() # base quality line
-            if len(seq) == 0:
-                break
-            sequences.append(seq)
-            qualities.append(qual)
-    return sequences, qualities
+# Takes a DNA string and returns its reverse complement
+from .reverse_complement import reverse_complement as reverseComplement
 
 # Turns	Q into Phred+33	ASCII-encoded quality
 def QtoPhred33(Q):
@@ -117,7 +88,7 @@ def naive_2mm(p, t):  # pattern, text
                 mismatches += 1
                 if mismatches > 2:
                     match = False
-                continue
+                    break # no need to look further
         if match:
             occurrences.append(i)  # all chars matched; record
     print("\n" + str(len(occurrences)),"matches found")
@@ -142,30 +113,32 @@ def createHist(qualities):
             hist[q] += 1
     return hist
 
-# Opens file
-while True:
-    file = input("Enter file name: " )
-    if file == "":
-        break
-    try:
-        fileh = open(file)
-        break
-    except:
+def main():
+    # Opens file
+    while True:
+        file = input("Enter file name: " )
+        if file == "":
+            break
+        if os.path.isfile(file):
+            break
         print("No such file in directory.")
 
-# For .fa files
-pattern = input("Enter DNA pattern (ALL CAPS): ")
-#genome = readGenome(file)
-genome = "CACTTAATTTG"
-#naive(pattern, genome)
-naive_with_rc(pattern, genome)
-naive_2mm(pattern, genome)
+    # For .fa files
+    pattern = input("Enter DNA pattern (ALL CAPS): ")
+    #genome = readGenome(file)
+    genome = "CACTTAATTTG"
+    #naive(pattern, genome)
+    naive_with_rc(pattern, genome)
+    naive_2mm(pattern, genome)
+
+    # For .fastaq files
+    # sequences, qualities = readFastq(file)
 
-# For .fastaq files
-# sequences, qualities = readFastq(file)
+    # Plots histogram
+    #import matplotlib.pyplot as plt
+    #h = createHist(qualities)
+    #plt.bar(range(len(h)),h)
+    #plt.show()
 
-# Plots histogram
-#import matplotlib.pyplot as plt
-#h = createHist(qualities)
-#plt.bar(range(len(h)),h)
-#plt.show()
+if __name__ == '__main__':
+    main()
@@ -2,39 +2,17 @@
 # Part of the 'Genomic Data Science' Specialization | Course 3: Algorithms for DNA Sequencing
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 25 Oct 22
 
+import os
+
 # Takes a DNA string and returns its reverse complement
-def reverseComplement(s):
-    complement = {'A': 'T', 'C': 'G', 'G': 'C', 'T': 'A', 'N': 'N'}
-    t = ''
-    for base in s:
-        t = complement[base] + t
-    return t
+from .reverse_complement import reverse_complement as reverseComplement
 
 # Parses a DNA reference genome from a file in the FASTA format
-def readGenome(filename):
-    genome = ''
-    with open(filename, 'r') as f:
-        for line in f:
-            # ignore header line with genome information
-            if not line[0] == '>':
-                genome += line.rstrip()
-    return genome
+from .fasta_loader import read_genome as readGenome
 
-# Parses the read and quality strings from a FASTQ file containing sequencing reads
-def readFastq(filename):
-    sequences = []
-    qualities = []
-    with open(filename) as fh:
-        while True:
-            fh.readline()  # skip name line
-            seq = fh.readline().rstrip()  # read base sequence
-            fh.readline()  # skip placeholder line
-            qual = fh.readline().rstrip() # base quality line
-            if len(seq) == 0:
-                break
-            sequences.append(seq)
-            qualities.append(qual)
-    return sequences, qualities
+# Quality histogram and two-strand exact matching
+from .fastq_qc import quality_histogram
+from .strand_search import strand_match
 
 # Turns	Q into Phred+33	ASCII-encoded quality
 def QtoPhred33(Q):
@@ -117,7 +95,7 @@ def naive_2mm(p, t):  # pattern, text
                 mismatches += 1
                 if mismatches > 2:
                     match = False
-                continue
+                    break # no need to look further
         if match:
             occurrences.append(i)  # all chars matched; record
     print("\n" + str(len(occurrences)),"matches found")
@@ -135,36 +113,37 @@ def naive_2mm(p, t):  # pattern, text
 
 # Creates histogram of qualities and their frequency
 def createHist(qualities):
-    hist = [0] * 50
-    for qual in qualities:
-        for phred in qual:
-            q = phred33ToQ(phred)
-            hist[q] += 1
-    return hist
+    return quality_histogram(qualities).tolist() # decoded in bulk, one bin per possible Q (0-93)
 
-# Opens file
-while True:
-    file = input("Enter file name: " )
-    if file == "":
-        break
-    try:
-        fileh = open(file)
-        break
-    except:
+def main():
+    # Opens file
+    while True:
+        file = input("Enter file name: " )
+        if file == "":
+            break
+        if os.path.isfile(file):
+            break
         print("No such file in directory.")
 
-# For .fa files
-pattern = input("Enter DNA pattern (ALL CAPS): ")
-genome = readGenome(file)
-#naive(pattern, genome)
-naive_with_rc(pattern, genome)
-#naive_2mm(pattern, genome)
+    # For .fa files
+    pattern = input("Enter DNA pattern (ALL CAPS): ")
+    genome = readGenome(file)
+    #naive(pattern, genome)
+    #naive_with_rc(pattern, genome)
+    hits, _, _ = strand_match(pattern, genome) # both strands in one pass
+    print(len(hits),"matches found")
+    for hit in hits:
+        print(hit.offset, hit.strand)
+    #naive_2mm(pattern, genome)
+
+    # For .fastaq files
+    # sequences, qualities = readFastq(file)
 
-# For .fastaq files
-# sequences, qualities = readFastq(file)
+    # Plots histogram
+    #import matplotlib.pyplot as plt
+    #h = createHist(qualities)
+    #plt.bar(range(len(h)),h)
+    #plt.show()
 
-# Plots histogram
-#import matplotlib.pyplot as plt
-#h = createHist(qualities)
-#plt.bar(range(len(h)),h)
-#plt.show()
+if __name__ == '__main__':
+    main()
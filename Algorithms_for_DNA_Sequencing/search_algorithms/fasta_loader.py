@@ -0,0 +1,130 @@
+# Memory-mapped FASTA loader shared by the search, edit distance and assembly scripts
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import mmap
+import os
+
+CHUNK_SIZE = 1 << 24  # bytes of the mapped file copied per step while stripping newlines
+
+class FastaGenome(object):
+    """ Holds every record of a (multi-)FASTA file concatenated into one
+        buffer, plus the offset where each record starts in it """
+
+    def __init__(self, seq, names, offsets):
+        self.seq = seq  # bytearray with all sequence lines, newlines removed
+        self.names = names  # record identifiers (first word of each header)
+        self.offsets = offsets  # record i is seq[offsets[i]:offsets[i+1]]
+
+    def __len__(self):
+        return len(self.seq)
+
+    def record(self, key):
+        """ Return a zero-copy view of one record, given its index or name """
+        i = key if isinstance(key, int) else self.names.index(key)
+        return memoryview(self.seq)[self.offsets[i]:self.offsets[i+1]]
+
+    def records(self):
+        """ Yield (name, view) pairs for every record in file order """
+        for i in range(len(self.names)):
+            yield self.names[i], self.record(i)
+
+def load_fasta(filename):
+    """ Read a (multi-)FASTA file by memory-mapping it and deleting line
+        breaks in bulk into one preallocated buffer. Runs in time linear in
+        the file size, unlike building the genome with repeated '+='. """
+    with open(filename, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return FastaGenome(bytearray(), [], [0])
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            seq = bytearray(size)  # sequence can never be longer than the file
+            names = []
+            offsets = []
+            pos = 0  # bytes of sequence written so far
+            start = 0  # current position in the mapped file
+            if mm[0] != ord('>'):  # sequence lines before any header
+                names.append('')
+                offsets.append(0)
+            while start < size:
+                if mm[start] == ord('>'):
+                    eol = mm.find(b'\n', start)
+                    if eol == -1:
+                        eol = size
+                    words = mm[start+1:eol].split()
+                    names.append(words[0].decode() if words else '')
+                    offsets.append(pos)
+                    start = eol + 1
+                    continue
+                nxt = mm.find(b'\n>', start)  # end of this record's sequence lines
+                end = size if nxt == -1 else nxt + 1
+                for i in range(start, end, CHUNK_SIZE):
+                    block = mm[i:min(i + CHUNK_SIZE, end)].translate(None, b'\r\n')
+                    seq[pos:pos+len(block)] = block
+                    pos += len(block)
+                start = end
+            del seq[pos:]
+            offsets.append(pos)
+    return FastaGenome(seq, names, offsets)
+
+def read_genome(filename):
+    """ Drop-in replacement for readGenome/readFASTA: return all sequence
+        lines of a FASTA file joined into a single string """
+    return load_fasta(filename).seq.decode()
+
+def iter_fasta_chunks(filename, chunk_size=1 << 20):
+    """ Yield the sequence lines of a FASTA file as strings of about
+        chunk_size characters, so a genome can be streamed without
+        holding it in memory. Records are concatenated like read_genome. """
+    lines = []
+    size = 0
+    with open(filename, 'r') as f:
+        for line in f:
+            if line[0] == '>':
+                continue
+            line = line.rstrip()
+            lines.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield ''.join(lines)
+                lines = []
+                size = 0
+    if lines:
+        yield ''.join(lines)
+
+if __name__ == '__main__':
+    # Benchmark against the string-concatenation loaders used by the scripts
+    import sys
+    import tempfile
+    import time
+
+    def read_genome_concat(filename):
+        genome = ''
+        with open(filename, 'r') as f:
+            for line in f:
+                if not line[0] == '>':
+                    genome += line.rstrip()
+        return genome
+
+    def best_time(fn, filename, repeat=3):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(filename)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'chr1.GRCh38.excerpt.fasta'
+    scale = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    assert read_genome(filename) == read_genome_concat(filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    with tempfile.NamedTemporaryFile(suffix='.fasta') as tmp:
+        tmp.write(data * scale)  # multi-FASTA with 'scale' copies of every record
+        tmp.flush()
+        for name, path in ((filename, filename), (str(scale) + 'x ' + filename, tmp.name)):
+            old = best_time(read_genome_concat, path)
+            new = best_time(read_genome, path)
+            print(name)
+            print("string concatenation: %.3f s" % old)
+            print("memory-mapped loader: %.3f s (%.1fx)" % (new, old / new))
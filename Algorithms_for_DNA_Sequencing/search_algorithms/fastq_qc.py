@@ -0,0 +1,111 @@
+# Quality control report for FASTQ files computed in one streaming pass with NumPy
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import numpy as np
+
+from .fastq_reader import iter_fastq_blocks
+
+MAX_Q = 93  # highest quality Phred+33 can encode ('~')
+
+def decode_qualities(quals):
+    """ Return all Phred+33 quality strings (bytes or str) joined and
+        decoded into one array of Q values """
+    joined = b''.join(q.encode() if isinstance(q, str) else q for q in quals)
+    q = np.frombuffer(joined, dtype=np.uint8).astype(np.int16) - 33
+    if len(q) and (q.min() < 0 or q.max() > MAX_Q):
+        raise ValueError("quality character outside the Phred+33 range")
+    return q
+
+def quality_histogram(quals):
+    """ Return hist with hist[q] = number of bases of quality q """
+    return np.bincount(decode_qualities(quals), minlength=MAX_Q + 1)
+
+class QualityStats(object):
+    """ Accumulated QC statistics of a set of reads: global quality
+        histogram, per-cycle quality counts, base composition. Partial
+        results from different chunks of a file can be merged. """
+
+    def __init__(self):
+        self.reads = 0
+        self.hist = np.zeros(MAX_Q + 1, dtype=np.int64)  # hist[q] = bases with quality q
+        self.per_cycle = np.zeros((0, MAX_Q + 1), dtype=np.int64)  # per_cycle[i, q] at read position i
+        self.bases = np.zeros(256, dtype=np.int64)  # count of every base character
+
+    def add(self, seqs, quals):
+        """ Add a batch of reads given as lists of sequences and qualities """
+        q = decode_qualities(quals)
+        lengths = np.array([len(x) for x in quals], dtype=np.int64)
+        self.reads += len(lengths)
+        if len(q) == 0:
+            return self
+        self.hist += np.bincount(q, minlength=MAX_Q + 1)
+        starts = np.cumsum(lengths) - lengths
+        cycle = np.arange(len(q)) - np.repeat(starts, lengths)  # position of each base in its read
+        cycles = int(lengths.max())
+        counts = np.bincount(cycle * (MAX_Q + 1) + q, minlength=cycles * (MAX_Q + 1))
+        self._grow(cycles)
+        self.per_cycle[:cycles] += counts.reshape(cycles, MAX_Q + 1)
+        joined = b''.join(s.encode() if isinstance(s, str) else s for s in seqs)
+        self.bases += np.bincount(np.frombuffer(joined, dtype=np.uint8), minlength=256)
+        return self
+
+    def _grow(self, cycles):
+        if cycles > len(self.per_cycle):
+            extra = np.zeros((cycles - len(self.per_cycle), MAX_Q + 1), dtype=np.int64)
+            self.per_cycle = np.vstack((self.per_cycle, extra))
+
+    def merge(self, other):
+        """ Add the statistics of another QualityStats into this one """
+        self.reads += other.reads
+        self.hist += other.hist
+        self._grow(len(other.per_cycle))
+        self.per_cycle[:len(other.per_cycle)] += other.per_cycle
+        self.bases += other.bases
+        return self
+
+    def count(self, chars):
+        return int(sum(self.bases[ord(c)] for c in chars))
+
+    def gc_content(self):
+        """ Fraction of called (non-N) bases that are G or C """
+        called = self.count('ACGTacgt')
+        return self.count('GCgc') / called if called else 0.0
+
+    def n_count(self):
+        return self.count('Nn')
+
+    def mean_per_cycle(self):
+        """ Mean quality at every read position """
+        totals = self.per_cycle.sum(axis=1)
+        weighted = self.per_cycle @ np.arange(MAX_Q + 1)
+        return weighted / np.maximum(totals, 1)
+
+def _block_stats(block):
+    _, seqs, quals = block
+    return QualityStats().add(seqs, quals)
+
+def qc_report(filename, processes=1):
+    """ Compute QualityStats for a FASTQ file in one streaming pass. With
+        processes > 1 every block of reads is summarised in a worker
+        process and the partial results are merged. """
+    stats = QualityStats()
+    blocks = iter_fastq_blocks(filename)
+    if processes > 1:
+        import multiprocessing
+        with multiprocessing.Pool(processes) as pool:
+            for partial in pool.imap_unordered(_block_stats, blocks):
+                stats.merge(partial)
+    else:
+        for block in blocks:
+            stats.merge(_block_stats(block))
+    return stats
+
+if __name__ == '__main__':
+    import sys
+    stats = qc_report(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    print("reads:", stats.reads)
+    print("bases:", int(stats.hist.sum()))
+    print("GC content: %.2f%%" % (100 * stats.gc_content()))
+    print("N bases:", stats.n_count())
+    print("quality histogram:", {q: int(c) for q, c in enumerate(stats.hist) if c})
+    print("mean quality per cycle:", ' '.join('%.1f' % q for q in stats.mean_per_cycle()))
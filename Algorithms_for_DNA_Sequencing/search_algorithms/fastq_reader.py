@@ -0,0 +1,152 @@
+# Streaming FASTQ reader yielding records or fixed-size batches, with transparent gzip support
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import gzip
+
+BLOCK_SIZE = 1 << 20  # bytes read from the file at a time
+
+class FastqRecord(object):
+    """ One sequencing read: name (header without '@'), bases and Phred+33
+        qualities, all as bytes """
+    __slots__ = ('name', 'seq', 'qual')
+
+    def __init__(self, name, seq, qual):
+        self.name = name
+        self.seq = seq
+        self.qual = qual
+
+    def __repr__(self):
+        return 'FastqRecord(%r, %r, %r)' % (self.name, self.seq, self.qual)
+
+def open_fastq(filename):
+    """ Open a FASTQ file for binary reading, decompressing it on the fly
+        if it starts with the gzip magic number """
+    with open(filename, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(filename, 'rb')
+    return open(filename, 'rb')
+
+def _split(lines, n, filename):
+    """ Return the name, sequence and quality lines of the first n lines
+        (n a multiple of 4) as three lists, after checking every record's
+        '@' and '+' lines and that its sequence and qualities have the same
+        length, so a dropped line cannot shift the rest of the block """
+    names, seqs, seps, quals = lines[0:n:4], lines[1:n:4], lines[2:n:4], lines[3:n:4]
+    at, plus = ('@', '+') if n and isinstance(lines[0], str) else (b'@', b'+')
+    for name, seq, sep, qual in zip(names, seqs, seps, quals):
+        if not name.startswith(at) or not sep.startswith(plus) or len(seq) != len(qual):
+            raise ValueError("malformed FASTQ record in %s: %r" % (filename, name[:50]))
+    return [name[1:] for name in names], seqs, quals
+
+def iter_fastq_blocks(filename, block_size=BLOCK_SIZE, decode=False):
+    """ Yield (names, sequences, qualities) lists of bytes (str if decode)
+        for the records completed by each block read from a (possibly
+        gzipped) FASTQ file """
+    newline, cr = ('\n', '\r') if decode else (b'\n', b'\r')
+    with open_fastq(filename) as f:
+        pending = []  # complete lines not yet grouped into a record
+        tail = newline[:0]  # incomplete last line of the previous block
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            if decode:
+                block = block.decode()  # one call per block, not per line
+            if cr in block:
+                block = block.replace(cr, newline[:0])
+            lines = (tail + block).split(newline)
+            tail = lines.pop()
+            if pending:
+                lines = pending + lines
+            n = len(lines) - len(lines) % 4
+            if n:
+                yield _split(lines, n, filename)
+            pending = lines[n:]
+        if tail:
+            pending.append(tail)
+        while pending and not pending[-1]:  # trailing blank lines
+            pending.pop()
+        if len(pending) % 4:
+            raise ValueError("truncated FASTQ record at end of %s" % filename)
+        if pending:
+            yield _split(pending, len(pending), filename)
+
+def iter_fastq(filename, block_size=BLOCK_SIZE):
+    """ Yield a FastqRecord for every read in a (possibly gzipped) FASTQ file """
+    for names, seqs, quals in iter_fastq_blocks(filename, block_size):
+        yield from map(FastqRecord, names, seqs, quals)
+
+def iter_fastq_batches(filename, batch_size=100000, block_size=BLOCK_SIZE):
+    """ Yield lists of up to batch_size FastqRecords """
+    batch = []
+    for names, seqs, quals in iter_fastq_blocks(filename, block_size):
+        batch.extend(map(FastqRecord, names, seqs, quals))
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            batch = batch[batch_size:]
+    if batch:
+        yield batch
+
+def read_fastq(filename):
+    """ Drop-in replacement for readFastq/readFASTQ: return the lists of
+        sequence and quality strings """
+    sequences = []
+    qualities = []
+    for _, seqs, quals in iter_fastq_blocks(filename, decode=True):
+        sequences.extend(seqs)
+        qualities.extend(quals)
+    return sequences, qualities
+
+if __name__ == '__main__':
+    # Throughput benchmark against the line-by-line readers used by the scripts
+    import os
+    import shutil
+    import sys
+    import tempfile
+    import time
+
+    def read_fastq_lines(filename):
+        sequences = []
+        qualities = []
+        with open(filename) as fh:
+            while True:
+                fh.readline()
+                seq = fh.readline().rstrip()
+                fh.readline()
+                qual = fh.readline().rstrip()
+                if len(seq) == 0:
+                    break
+                sequences.append(seq)
+                qualities.append(qual)
+        return sequences, qualities
+
+    def count_records(filename):
+        return sum(1 for _ in iter_fastq(filename))
+
+    def count_blocks(filename):
+        return sum(len(seqs) for _, seqs, _ in iter_fastq_blocks(filename))
+
+    def reads_per_second(fn, filename, reads, repeat=3):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(filename)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return reads / best
+
+    filename = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ERR266411_1.for_asm.fastq')
+    sequences, qualities = read_fastq_lines(filename)
+    assert read_fastq(filename) == (sequences, qualities)
+    reads = len(sequences)
+    with tempfile.NamedTemporaryFile(suffix='.fastq.gz') as tmp:
+        with open(filename, 'rb') as src, gzip.open(tmp.name, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        assert read_fastq(tmp.name) == (sequences, qualities)
+        print(filename, "(%d reads)" % reads)
+        print("readFastq (line by line): %9.0f reads/s" % reads_per_second(read_fastq_lines, filename, reads))
+        print("read_fastq (str lists):   %9.0f reads/s" % reads_per_second(read_fastq, filename, reads))
+        print("iter_fastq (records):     %9.0f reads/s" % reads_per_second(count_records, filename, reads))
+        print("iter_fastq_blocks:        %9.0f reads/s" % reads_per_second(count_blocks, filename, reads))
+        print("iter_fastq (gzip):        %9.0f reads/s" % reads_per_second(count_records, tmp.name, reads))
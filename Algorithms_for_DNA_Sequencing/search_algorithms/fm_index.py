@@ -0,0 +1,126 @@
+# Suffix array, Burrows-Wheeler transform and FM-index for exact matching of patterns of any length
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import numpy as np
+
+def suffix_array(s):
+    """ Build the suffix array of s (integer array whose last element is a
+        unique smallest sentinel) by prefix doubling: sort suffixes by their
+        first 2^k characters using the ranks from the previous round """
+    n = len(s)
+    rank = s.astype(np.int64)
+    k = 1
+    while True:
+        second = np.full(n, -1, dtype=np.int64)  # rank of the suffix k characters further
+        second[:n-k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        r1, r2 = rank[sa], second[sa]
+        new_group = np.empty(n, dtype=bool)
+        new_group[0] = True
+        new_group[1:] = (r1[1:] != r1[:-1]) | (r2[1:] != r2[:-1])
+        ranks_in_order = np.cumsum(new_group) - 1
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = ranks_in_order
+        if ranks_in_order[-1] == n - 1:  # all suffixes distinguished
+            return sa
+        k *= 2
+
+class FMIndex(object):
+    """ FM-index of a text T: BWT with occurrence checkpoints every
+        occ_step rows and suffix array samples every sa_step text positions """
+
+    def __init__(self, t, occ_step=128, sa_step=32):
+        if isinstance(t, str):
+            t = t.encode()
+        text = np.frombuffer(t, dtype=np.uint8)
+        alphabet = np.unique(text)
+        self.codes = np.zeros(256, dtype=np.int64)  # byte -> code, 0 for '$' and absent bytes
+        self.codes[alphabet] = np.arange(1, len(alphabet) + 1)
+        self.present = np.zeros(256, dtype=bool)
+        self.present[alphabet] = True
+        s = np.append(self.codes[text], 0)  # append sentinel '$'
+        sa = suffix_array(s)
+        self.n = len(s)
+        self.occ_step = occ_step
+        self.sa_step = sa_step
+        self.bwt = s[sa - 1].astype(np.uint8)  # sa - 1 wraps to the sentinel for row of suffix 0
+        sigma = len(alphabet) + 1
+        counts = np.bincount(self.bwt, minlength=sigma)
+        self.first = np.concatenate(([0], np.cumsum(counts)[:-1]))  # C[c]: rows starting with < c
+        # Occurrence checkpoints: occ[r, c] = count of c in bwt[:r*occ_step]
+        self.occ = np.zeros((self.n // occ_step + 1, sigma), dtype=np.int64)
+        for c in range(sigma):
+            self.occ[1:, c] = np.cumsum(self.bwt == c)[occ_step-1::occ_step][:self.n // occ_step]
+        # SA samples, kept for rows whose suffix starts at a multiple of sa_step
+        rows = np.flatnonzero(sa % sa_step == 0)
+        self.sample_rows = rows
+        self.sample_pos = sa[rows]
+
+    def rank(self, c, i):
+        """ Number of occurrences of code c in bwt[:i] """
+        base = i // self.occ_step
+        start = base * self.occ_step
+        return int(self.occ[base, c]) + int(np.count_nonzero(self.bwt[start:i] == c))
+
+    def lf(self, i):
+        """ Map row i to the row of the suffix one position to its left """
+        c = self.bwt[i]
+        return int(self.first[c]) + self.rank(c, i)
+
+    def backward_search(self, p):
+        """ Backward search: return (lo, hi, steps) where rows lo..hi-1 are
+            prefixed by p and steps is the number of characters consumed """
+        if isinstance(p, str):
+            p = p.encode()
+        lo, hi = 0, self.n
+        steps = 0
+        for b in reversed(p):
+            if not self.present[b]:
+                return 0, 0, steps
+            c = self.codes[b]
+            lo = int(self.first[c]) + self.rank(c, lo)
+            hi = int(self.first[c]) + self.rank(c, hi)
+            steps += 1
+            if lo >= hi:
+                break
+        return lo, hi, steps
+
+    def lf_rows(self, rows):
+        """ LF mapping applied to an array of rows at once """
+        c = self.bwt[rows]
+        base = rows // self.occ_step
+        start = base * self.occ_step
+        cols = np.arange(self.occ_step)
+        window = self.bwt[np.minimum(start[:, None] + cols, self.n - 1)]
+        before = (window == c[:, None]) & (cols < (rows - start)[:, None])
+        return self.first[c] + self.occ[base, c] + np.count_nonzero(before, axis=1)
+
+    def locate(self, rows):
+        """ Return (text offsets of the given rows, total LF steps taken),
+            walking every unsampled row left until it reaches an SA sample """
+        rows = np.asarray(rows, dtype=np.int64)
+        offsets = np.empty(len(rows), dtype=np.int64)
+        pending = np.arange(len(rows))
+        steps = 0
+        total = 0
+        while len(pending) > 0:
+            j = np.minimum(np.searchsorted(self.sample_rows, rows), len(self.sample_rows) - 1)
+            sampled = self.sample_rows[j] == rows
+            offsets[pending[sampled]] = self.sample_pos[j[sampled]] + steps
+            pending, rows = pending[~sampled], rows[~sampled]
+            if len(rows) > 0:
+                rows = self.lf_rows(rows)
+                steps += 1
+                total += len(rows)
+        return offsets, total
+
+    def match(self, p):
+        """ Find exact occurrences of p. Returns (occurrences, alignments,
+            comparisons) like naive and boyer_moore, where alignments counts
+            backward-search steps and comparisons counts rank lookups """
+        lo, hi, steps = self.backward_search(p)
+        if len(p) == 0 or lo >= hi:
+            return [], steps, 2 * steps
+        offsets, lf_steps = self.locate(np.arange(lo, hi))
+        offsets.sort()
+        return offsets.tolist(), steps, 2 * steps + lf_steps
@@ -0,0 +1,49 @@
+# Cold-import benchmark: time to import the package and individual names in a fresh interpreter
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+#
+# Run from the Algorithms_for_DNA_Sequencing directory:
+#     python -m search_algorithms.import_benchmark [repeat]
+
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    'import search_algorithms',
+    'from search_algorithms import BoyerMoore',
+    'from search_algorithms import naive, boyer_moore',
+    'from search_algorithms import Index',
+    'from search_algorithms import KmerIndex',
+    'from search_algorithms import FMIndex',
+    'from search_algorithms import read_fastq',
+    'import search_algorithms.dna_naiveBM',
+]
+
+# Child process: time the statement after interpreter start-up, report
+# whether it pulled in NumPy
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+print(time.perf_counter() - start, 'numpy' in sys.modules)
+'''
+
+def cold_import_time(statement, repeat=5):
+    """ Return (best seconds, numpy loaded) over repeat fresh interpreters """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', PROBE, statement], cwd=root,
+                             capture_output=True, text=True, check=True).stdout.split()
+        elapsed, numpy = float(out[0]), out[1] == 'True'
+        best = elapsed if best is None else min(best, elapsed)
+    return best, numpy
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for statement in STATEMENTS:
+        elapsed, numpy = cold_import_time(statement, repeat)
+        print("%-50s %8.1f ms%s" % (statement, 1000 * elapsed, '  (imports numpy)' if numpy else ''))
+
+if __name__ == '__main__':
+    main()
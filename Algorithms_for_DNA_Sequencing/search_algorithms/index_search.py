@@ -0,0 +1,67 @@
+# Substring index over the k-mers of a text, and pigeonhole approximate matching on top of it
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+__author__ = "Ben Langmead"
+
+import bisect
+
+class Index(object):
+    """ Holds a substring index for a text T """
+    def __init__(self, t, k):
+        """ Create index from all substrings of t of length k """
+        self.k = k # k-mer length (k)
+        self.index = []
+        for i in range(len(t)-k+1): # for each k-mer
+            self.index.append((str(t[i:i+k]), i)) # add (k-mer, offset) pair; str() for PackedSequence views
+        self.index.sort()
+
+    def query(self, p):
+        """ Return index hits for first k-mer of p """
+        kmer = p[:self.k] # query with first k-mer
+        i = bisect.bisect_left(self.index, (kmer, -1)) # binary search
+        hits = []
+        while i < len(self.index): # # collect matching index entries
+            if self.index[i][0] != kmer:
+                break # end of multimap equal range
+            hits.append(self.index[i][1])
+            i += 1
+        return hits
+
+# Partial matching algroithm implementation using an exact matching algorithm (Indexing)
+# Combined with the pigeon hole principle to allow up to k mismatches of pattern in text
+# Pass a prebuilt (or KmerIndex.open()-ed) index to reuse it across many patterns
+def approximate_match_index(p, t, k, index=None): #pattern, text, mismatches
+    segment_length = round(len(p) // (k+1))
+    hits = 0
+    all_matches = set()
+    if index is None:
+        from .kmer_index import KmerIndex # NumPy is only needed here, keep Index import light
+        index = KmerIndex.build(t, 8) # built on 8-mers
+    for i in range(k+1):
+        start = i * segment_length
+        end = min((i+1) * segment_length, len(p))
+        matches = index.query(p[start:end])
+        hits += len(matches)
+        for m in matches:
+            text_offset = m - start
+            if text_offset < 0 or (text_offset + len(p)) > len(t):
+                continue
+            mismatches = 0
+            for j in range(0, start):
+                if not p[j] == t[text_offset + j]:
+                    mismatches += 1
+                    if mismatches > k:
+                        break
+            for j in range(start + index.k, end): # the index only matched the first k bases of the segment
+                if not p[j] == t[text_offset + j]:
+                    mismatches += 1
+                    if mismatches > k:
+                        break
+            for j in range(end, len(p)):
+                if not p[j] == t[text_offset + j]:
+                    mismatches += 1
+                    if mismatches > k:
+                        break
+            if mismatches <= k:
+                all_matches.add(text_offset)
+    return list(all_matches), hits
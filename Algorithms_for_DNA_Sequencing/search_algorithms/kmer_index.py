@@ -0,0 +1,128 @@
+# Compact k-mer index backed by NumPy arrays that can be saved to disk and reopened with mmap
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import mmap
+import struct
+
+import numpy as np
+
+# 2-bit code of each byte value; anything other than A/C/G/T maps to 4
+BASE_CODES = np.full(256, 4, dtype=np.uint8)
+for _i, _c in enumerate(b'ACGT'):
+    BASE_CODES[_c] = _i
+    BASE_CODES[ord(chr(_c).lower())] = _i
+
+def encode_bases(t):
+    """ Return t (str, bytes, buffer or PackedSequence) as a uint8 array
+        of 2-bit base codes """
+    if hasattr(t, 'base_codes'):
+        return t.base_codes()
+    if isinstance(t, str):
+        t = t.encode()
+    return BASE_CODES[np.frombuffer(t, dtype=np.uint8)]
+
+def kmer_codes(t, k):
+    """ Return the packed integer code of every k-mer of t, and a boolean
+        array that is False for k-mers containing a non-ACGT character """
+    assert 0 < k <= 32
+    c = encode_bases(t)
+    n = len(c) - k + 1
+    if n <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+    codes = np.zeros(n, dtype=np.uint64)
+    valid = np.ones(n, dtype=bool)
+    for j in range(k):
+        window = c[j:j+n]
+        codes <<= np.uint64(2)
+        codes |= (window & 3).astype(np.uint64)
+        valid &= window != 4
+    return codes, valid
+
+def kmer_code(s):
+    """ Return the packed integer code of a single k-mer, or None if it
+        contains a non-ACGT character """
+    code = 0
+    for c in encode_bases(s).tolist():
+        if c == 4:
+            return None
+        code = (code << 2) | c
+    return code
+
+class KmerIndex(object):
+    """ Substring index for a text T holding a sorted array of 2-bit packed
+        k-mer codes and a parallel array with the offset of each k-mer """
+
+    MAGIC = b'KMERIDX1'
+    HEADER = struct.Struct('<8sQQQ')  # magic, k, number of entries, offset item size
+
+    def __init__(self, k, codes, offsets, mm=None):
+        self.k = k  # k-mer length (k)
+        self.codes = codes  # sorted uint64 k-mer codes
+        self.offsets = offsets  # offsets[i] is where codes[i] occurs in T
+        self._mm = mm  # backing mmap when opened from a file
+
+    @classmethod
+    def build(cls, t, k):
+        """ Create index from all substrings of t of length k, skipping
+            those that contain N or other ambiguous bases """
+        codes, valid = kmer_codes(t, k)
+        offset_type = np.uint32 if len(codes) < 2**32 else np.uint64
+        offsets = np.flatnonzero(valid).astype(offset_type)
+        codes = codes[valid]
+        order = np.argsort(codes, kind='stable')  # equal k-mers keep increasing offsets
+        return cls(k, codes[order], offsets[order])
+
+    def save(self, filename):
+        """ Write the index to a file that open() can map back in """
+        with open(filename, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.k, len(self.codes), self.offsets.dtype.itemsize))
+            f.write(np.ascontiguousarray(self.codes, dtype='<u8').tobytes())
+            f.write(np.ascontiguousarray(self.offsets, dtype='<u%d' % self.offsets.dtype.itemsize).tobytes())
+
+    @classmethod
+    def open(cls, filename):
+        """ Map a saved index into memory without copying or re-sorting it """
+        with open(filename, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, k, n, itemsize = cls.HEADER.unpack_from(mm, 0)
+        if magic != cls.MAGIC:
+            mm.close()
+            raise ValueError("%s is not a k-mer index file" % filename)
+        start = cls.HEADER.size
+        codes = np.frombuffer(mm, dtype='<u8', count=n, offset=start)
+        offsets = np.frombuffer(mm, dtype='<u%d' % itemsize, count=n, offset=start + 8*n)
+        return cls(k, codes, offsets, mm)
+
+    def close(self):
+        """ Release the mapping of an index opened from a file. Arrays
+            returned by lookup() are views into it: while one is still
+            referenced the mapping cannot be unmapped here, and is released
+            by garbage collection once the last view is gone. """
+        if self._mm is not None:
+            mm, self._mm = self._mm, None
+            self.codes = self.offsets = None  # views into mm, dropped first
+            try:
+                mm.close()
+            except BufferError:
+                pass  # lookup() results still alive
+
+    def __len__(self):
+        return len(self.codes)
+
+    def lookup(self, code):
+        """ Return an array view with the offsets of a packed k-mer code;
+            copy it to keep it past close() """
+        code = np.uint64(code)
+        lo = np.searchsorted(self.codes, code, side='left')
+        hi = np.searchsorted(self.codes, code, side='right')
+        return self.offsets[lo:hi]
+
+    def query(self, p):
+        """ Return index hits for first k-mer of p """
+        kmer = p[:self.k]  # query with first k-mer
+        if len(kmer) < self.k:
+            return []
+        code = kmer_code(kmer)
+        if code is None:
+            return []
+        return self.lookup(code).tolist()
@@ -0,0 +1,66 @@
+# Naive and Boyer-Moore matchers that count alignments and character comparisons
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+# Naive exact matching algorithm (without reverse complement)
+def naive(p, t):
+    occurrences = []
+    alignments = 0
+    comparisons = 0
+    for i in range(len(t) - len(p) + 1):  # loop over alignments
+        alignments += 1
+        match = True
+        for j in range(len(p)):  # loop over characters
+            comparisons += 1
+            if t[i+j] != p[j]:  # compare characters
+                match = False
+                break
+        if match:
+            occurrences.append(i)  # all chars matched; record
+    return occurrences, alignments, comparisons
+
+# Naive matching algorithm (without reverse complement, allows for n mismatches)
+def naive_mm(p, t, n):  # pattern, text, allowed mismatches
+    occurrences = []
+    alignments_count = 0
+    comparisons_count = 0
+    for i in range(len(t) - len(p) + 1):  # loop over alignments
+        mismatches = 0
+        match = True
+        alignments_count += 1
+        for j in range(len(p)):  # loop over characters
+            comparisons_count += 1
+            if t[i+j] != p[j]:  # compare characters
+                mismatches += 1
+                if mismatches > n:
+                    match = False
+                    break # no need to look further
+        if match:
+            occurrences.append(i)  # all chars matched; record
+    return occurrences, alignments_count, comparisons_count
+
+# Boyer Moore matching algorithm
+def boyer_moore(p, p_bm, t):
+    """ Do Boyer-Moore matching. p=pattern, t=text,
+        p_bm=BoyerMoore object for p """
+    i = 0
+    occurrences = []
+    alignments = 0
+    comparisons = 0
+    while i < len(t) - len(p) + 1:
+        alignments += 1
+        shift = 1
+        mismatched = False
+        for j in range(len(p)-1, -1, -1):
+            comparisons += 1
+            if p[j] != t[i+j]:
+                skip_bc = p_bm.bad_character_rule(j, t[i+j])
+                skip_gs = p_bm.good_suffix_rule(j)
+                shift = max(shift, skip_bc, skip_gs)
+                mismatched = True
+                break
+        if not mismatched:
+            occurrences.append(i)
+            skip_gs = p_bm.match_skip()
+            shift = max(shift, skip_gs)
+        i += shift
+    return occurrences, alignments, comparisons
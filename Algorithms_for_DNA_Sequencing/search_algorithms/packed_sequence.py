@@ -0,0 +1,112 @@
+# 2-bit packed nucleotide sequence with a side list of N runs, usable wherever a genome string is
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import bisect
+from array import array
+
+import numpy as np
+
+from .kmer_index import encode_bases
+
+LETTERS = np.frombuffer(b'ACGT', dtype=np.uint8)
+
+class PackedSequence(object):
+    """ DNA sequence stored at 2 bits per base, four bases per byte with
+        the first base in the high bits. Non-ACGT characters are stored as
+        N in a sorted list of [start, end) runs, and case is not kept.
+        Slicing returns a view sharing the same buffers. Indexing, len()
+        and iteration behave like the str, so naive, boyer_moore,
+        editDistance and Index accept it in place of the genome string. """
+
+    def __init__(self, data, n_starts, n_ends, start, stop):
+        self.data = data  # packed bases (bytes)
+        self.n_starts = n_starts  # starts of N runs, in absolute base positions
+        self.n_ends = n_ends
+        self.start = start  # this view covers bases start..stop-1 of data
+        self.stop = stop
+
+    @classmethod
+    def from_str(cls, s):
+        """ Pack a str, bytes or bytearray sequence """
+        codes = encode_bases(s)
+        ambiguous = codes == 4
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], ambiguous.view(np.int8), [0]))))
+        n_starts = array('q', edges[0::2].tolist())
+        n_ends = array('q', edges[1::2].tolist())
+        codes = np.where(ambiguous, 0, codes)
+        padded = np.zeros((len(codes) + 3) // 4 * 4, dtype=np.uint8)
+        padded[:len(codes)] = codes
+        data = (padded[0::4] << 6) | (padded[1::4] << 4) | (padded[2::4] << 2) | padded[3::4]
+        return cls(data.tobytes(), n_starts, n_ends, 0, len(codes))
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def _in_n_run(self, pos):
+        i = bisect.bisect_right(self.n_starts, pos) - 1
+        return i >= 0 and pos < self.n_ends[i]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return str(self)[key]
+            return PackedSequence(self.data, self.n_starts, self.n_ends, self.start + start, self.start + max(start, stop))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("PackedSequence index out of range")
+        pos = self.start + key
+        if self.n_starts and self._in_n_run(pos):
+            return 'N'
+        return 'ACGT'[(self.data[pos >> 2] >> (6 - 2 * (pos & 3))) & 3]
+
+    def base_codes(self):
+        """ Return the view as a uint8 array of codes 0-3 for ACGT, 4 for N """
+        first, last = self.start >> 2, (self.stop + 3) >> 2
+        packed = np.frombuffer(self.data, dtype=np.uint8)[first:last]
+        codes = np.empty((len(packed), 4), dtype=np.uint8)
+        for j in range(4):
+            codes[:, j] = (packed >> (6 - 2 * j)) & 3
+        codes = codes.ravel()[self.start - 4 * first:self.stop - 4 * first]
+        lo = bisect.bisect_right(self.n_ends, self.start)
+        for i in range(lo, len(self.n_starts)):
+            if self.n_starts[i] >= self.stop:
+                break
+            codes[max(self.n_starts[i], self.start) - self.start:min(self.n_ends[i], self.stop) - self.start] = 4
+        return codes
+
+    def __str__(self):
+        n = len(self)
+        if 0 < n <= 32:  # short views (k-mers) skip the array round trip
+            code = self.kmer(0, n)
+            if code is not None:
+                return ''.join(['ACGT'[(code >> (2 * (n - 1 - j))) & 3] for j in range(n)])
+        codes = self.base_codes()
+        letters = np.where(codes == 4, ord('N'), LETTERS[np.minimum(codes, 3)])
+        return letters.astype(np.uint8).tobytes().decode()
+
+    def __iter__(self):
+        for i in range(0, len(self), 1 << 16):  # decode 64k bases at a time
+            yield from str(self[i:i + (1 << 16)])
+
+    def kmer(self, i, k):
+        """ Return the 2-bit code (first base most significant, like
+            kmer_index.kmer_code) of the k-mer at offset i, or None if it
+            contains an N. Reads at most k/4 + 2 bytes, so O(1) for a fixed
+            maximum k. """
+        pos = self.start + i
+        if i < 0 or k <= 0 or i + k > len(self):
+            raise IndexError("k-mer out of range")
+        if self.n_starts:
+            j = bisect.bisect_left(self.n_ends, pos + 1)  # first run ending after pos
+            if j < len(self.n_starts) and self.n_starts[j] < pos + k:
+                return None
+        first, last = pos >> 2, (pos + k - 1) >> 2
+        value = int.from_bytes(self.data[first:last+1], 'big')
+        trailing = 8 * (last - first + 1) - 2 * ((pos & 3) + k)
+        return (value >> trailing) & ((1 << (2 * k)) - 1)
+
+    def nbytes(self):
+        """ Memory used by the packed bases and N runs """
+        return len(self.data) + self.n_starts.itemsize * (len(self.n_starts) + len(self.n_ends))
@@ -0,0 +1,108 @@
+# Parallel search driver: runs a matcher over overlapping genome chunks in a process pool
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import os
+from multiprocessing import Pool, shared_memory
+
+from .bm_preproc import BoyerMoore
+from .matchers import naive, naive_mm, boyer_moore
+
+def _naive(p, t, n, prep):
+    return naive(p, t)
+
+def _naive_mm(p, t, n, prep):
+    return naive_mm(p, t, n)
+
+def _boyer_moore(p, t, n, prep):
+    return boyer_moore(p, prep, t)
+
+# name -> (function(p, chunk, n, preprocessed pattern), pattern preprocessing or None)
+MATCHERS = {
+    'naive': (_naive, None),
+    'naive_mm': (_naive_mm, None),
+    'boyer_moore': (_boyer_moore, BoyerMoore),
+}
+
+_worker = {}  # per-process state set up by _init_worker
+
+def _init_worker(shm_name, size, name, p, n):
+    """ Attach to the shared genome and preprocess the pattern once per process """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    function, preprocess = MATCHERS[name]
+    _worker.update(shm=shm, size=size, function=function, p=p, n=n,
+                   prep=preprocess(p) if preprocess is not None else None)
+
+def _search_chunk(bounds):
+    """ Run the matcher on the text of alignments lo..hi-1 and return hits
+        as genome offsets with the chunk's counters """
+    lo, hi = bounds
+    w = _worker
+    end = min(hi + len(w['p']) - 1, w['size'])
+    chunk = bytes(w['shm'].buf[lo:end]).decode()
+    occurrences, alignments, comparisons = w['function'](w['p'], chunk, w['n'], w['prep'])
+    return [lo + i for i in occurrences], alignments, comparisons
+
+def chunk_bounds(total, chunk_size):
+    """ Split alignment start positions 0..total-1 into [lo, hi) ranges """
+    return [(lo, min(lo + chunk_size, total)) for lo in range(0, total, chunk_size)]
+
+def parallel_search(p, t, matcher='naive', n=0, processes=None, chunk_size=None):
+    """ Search p in t (str, bytes or bytearray) with one of the MATCHERS,
+        n being the mismatch budget of naive_mm. The genome is copied once
+        into shared memory; each task covers a range of alignment starts
+        and reads that range plus len(p)-1 bases of overlap, so every
+        occurrence, including one spanning a boundary, is found by exactly
+        one task. Returns (occurrences, alignments, comparisons) with sorted
+        offsets and summed counters. The naive counters equal a serial run;
+        boyer_moore restarts its shifts at each chunk, so its counters can
+        differ slightly from a single scan. """
+    if matcher not in MATCHERS:
+        raise ValueError("unknown matcher %r, expected one of %s" % (matcher, ', '.join(MATCHERS)))
+    data = t.encode() if isinstance(t, str) else t
+    m = len(p)
+    total = len(data) - m + 1  # number of alignments
+    if m == 0 or total <= 0:
+        return [], max(0, total), 0
+    processes = processes or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1 << 16, -(-total // (processes * 8)))  # a few tasks per process for balance
+    bounds = chunk_bounds(total, chunk_size)
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        args = (shm.name, len(data), matcher, p, n)
+        if processes == 1:
+            _init_worker(*args)
+            try:
+                results = [_search_chunk(b) for b in bounds]
+            finally:
+                _worker.pop('shm').close()
+        else:
+            with Pool(processes, initializer=_init_worker, initargs=args) as pool:
+                results = pool.map(_search_chunk, bounds)
+    finally:
+        shm.close()
+        shm.unlink()
+    occurrences = set()
+    alignments = comparisons = 0
+    for occ, a, c in results:
+        occurrences.update(occ)
+        alignments += a
+        comparisons += c
+    return sorted(occurrences), alignments, comparisons
+
+if __name__ == '__main__':
+    import time
+    from . import data_path
+    from .fasta_loader import read_genome
+    seq = read_genome(data_path('chr1.GRCh38.excerpt.fasta'))
+    p = 'GGCGCGGTGGCTCACGCCTGTAAT'
+    for matcher in ('naive_mm', 'boyer_moore'):
+        start = time.perf_counter()
+        occ1, a1, c1 = parallel_search(p, seq, matcher, 2, processes=1)
+        serial = time.perf_counter() - start
+        start = time.perf_counter()
+        occ, a, c = parallel_search(p, seq, matcher, 2)
+        pooled = time.perf_counter() - start
+        print("%-12s %d processes: %.2f s (1 process: %.2f s) matches: %d alignments: %d comparisons: %d"
+              % (matcher, os.cpu_count(), pooled, serial, len(occ), a, c))
@@ -0,0 +1,48 @@
+# Table-driven reverse complement for strings, bytes, read batches and whole chromosome buffers
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+# IUPAC nucleotide codes and their complements; soft-masked (lowercase) bases stay lowercase
+BASES = 'ACGTUNRYSWKMBDHV'
+COMPLEMENTS = 'TGCAANYRSWMKVHDB'
+BASES += BASES.lower()
+COMPLEMENTS += COMPLEMENTS.lower()
+
+STR_TABLE = str.maketrans(BASES, COMPLEMENTS)
+BYTES_TABLE = bytes.maketrans(BASES.encode(), COMPLEMENTS.encode())
+
+def reverse_complement(s):
+    """ Return the reverse complement of a str, bytes, bytearray or
+        memoryview in linear time. Characters that are not IUPAC
+        nucleotide codes (e.g. gaps) are kept as they are. """
+    if isinstance(s, str):
+        return s.translate(STR_TABLE)[::-1]
+    if isinstance(s, memoryview):
+        s = s.tobytes()
+    return s.translate(BYTES_TABLE)[::-1]
+
+def reverse_complement_batch(seqs):
+    """ Reverse complement a list of reads (all str or all bytes) with a
+        single translate and a single reversal over the joined batch """
+    if not seqs:
+        return []
+    sep = '\n' if isinstance(seqs[0], str) else b'\n'
+    result = reverse_complement(sep.join(seqs)).split(sep)
+    result.reverse()  # the reads came out in reverse order
+    return result
+
+CHUNK_SIZE = 1 << 20  # bytes swapped at a time by reverse_complement_inplace
+
+def reverse_complement_inplace(buf, chunk_size=CHUNK_SIZE):
+    """ Reverse complement a bytearray (e.g. a whole chromosome from
+        load_fasta) in place: chunks from the two ends are complemented,
+        reversed and swapped, so the extra memory is a few chunks rather
+        than a copy of buf """
+    lo, hi = 0, len(buf)
+    while hi - lo >= 2 * chunk_size:
+        head = buf[lo:lo+chunk_size].translate(BYTES_TABLE)[::-1]
+        buf[lo:lo+chunk_size] = buf[hi-chunk_size:hi].translate(BYTES_TABLE)[::-1]
+        buf[hi-chunk_size:hi] = head
+        lo += chunk_size
+        hi -= chunk_size
+    buf[lo:hi] = buf[lo:hi].translate(BYTES_TABLE)[::-1]  # middle, under two chunks
+    return buf
@@ -0,0 +1,51 @@
+# Bit-parallel k-mismatch search (Baeza-Yates-Gonnet Shift-Add) and a NumPy Hamming distance scan
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import numpy as np
+
+def shift_add(p, t, n):  # pattern, text, allowed mismatches
+    """ Return (occurrences, alignments, comparisons) like naive_mm. The
+        state packs one counter per pattern position, wide enough to hold
+        len(p) without overflowing: counter j holds the mismatches of
+        p[:j+1] against the text ending at the current character, so each
+        text character costs one shift and one add on the whole state.
+        comparisons counts the text characters consumed. """
+    m = len(p)
+    if m == 0 or m > len(t):
+        return [], max(0, len(t) - m + 1), 0
+    width = m.bit_length()  # bits per counter
+    mask = (1 << (width * m)) - 1
+    ones = sum(1 << (j * width) for j in range(m))  # +1 in every counter
+    table = {}  # character -> +1 in the counters of the positions it mismatches
+    for c in set(p):
+        table[c] = ones - sum(1 << (j * width) for j in range(m) if p[j] == c)
+    top = (m - 1) * width
+    counter = (1 << width) - 1
+    occurrences = []
+    state = 0
+    for i, c in enumerate(t):
+        state = ((state << width) + table.get(c, ones)) & mask
+        if (state >> top) & counter <= n and i >= m - 1:
+            occurrences.append(i - m + 1)
+    return occurrences, len(t) - m + 1, len(t)
+
+def hamming_mm(p, t, n, chunk_size=1 << 22):  # pattern, text, allowed mismatches
+    """ Return (occurrences, alignments, comparisons) like naive_mm, counting
+        the mismatches of every alignment at once with NumPy: the text is
+        processed as uint8 arrays in chunks, one vectorized comparison per
+        pattern position. comparisons counts the characters compared. """
+    pb = np.frombuffer(p.encode() if isinstance(p, str) else p, dtype=np.uint8)
+    tb = np.frombuffer(t.encode() if isinstance(t, str) else t, dtype=np.uint8)
+    m = len(pb)
+    total = len(tb) - m + 1  # number of alignments
+    if m == 0 or total <= 0:
+        return [], max(0, total), 0
+    occurrences = []
+    for start in range(0, total, chunk_size):
+        count = min(chunk_size, total - start)
+        region = tb[start:start + count + m - 1]
+        mismatches = np.zeros(count, dtype=np.int32)
+        for j in range(m):
+            mismatches += region[j:j + count] != pb[j]
+        occurrences.extend((np.flatnonzero(mismatches <= n) + start).tolist())
+    return occurrences, total, total * m
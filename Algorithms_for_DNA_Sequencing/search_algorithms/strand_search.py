@@ -0,0 +1,51 @@
+# Strand-aware exact matching: finds a pattern and its reverse complement in a single pass
+# Part of Genomic Data Science Specialization - Algorithms for DNA Sequencing by Johns Hopkins University through Coursera
+
+import collections
+
+from .reverse_complement import reverse_complement
+
+StrandHit = collections.namedtuple('StrandHit', ['offset', 'strand'])
+
+def horspool_shifts(patterns):
+    """ Bad character shifts shared by equal-length patterns: the distance
+        from the last occurrence of each character (excluding the final
+        position) to the end, minimised over the patterns """
+    m = len(patterns[0])
+    shifts = {}
+    for x in patterns:
+        for j in range(m-1):
+            shifts[x[j]] = min(shifts.get(x[j], m), m-1-j)
+    return shifts
+
+def strand_match(p, t):
+    """ Find occurrences of p on both strands of t with a two-pattern
+        Horspool scan. Returns (hits, alignments, comparisons) where hits
+        is a list of StrandHit(offset, strand) in offset order, strand
+        being '+' for p and '-' for its reverse complement (a palindromic
+        p is reported once, as '+'), and comparisons counts last-character
+        tests plus full-pattern verifications. """
+    m = len(p)
+    if m == 0:
+        return [], 0, 0
+    rc = reverse_complement(p)
+    patterns = [(p, '+')] if rc == p else [(p, '+'), (rc, '-')]
+    shifts = horspool_shifts([x for x, _ in patterns])
+    last_chars = collections.defaultdict(list)  # last character -> patterns ending with it
+    for x, strand in patterns:
+        last_chars[x[-1]].append((x, strand))
+    hits = []
+    alignments = 0
+    comparisons = 0
+    i = 0
+    end = len(t) - m
+    while i <= end:
+        alignments += 1
+        comparisons += 1
+        c = t[i+m-1]
+        for x, strand in last_chars.get(c, ()):
+            comparisons += 1
+            if t.startswith(x, i):
+                hits.append(StrandHit(i, strand))
+        i += shifts.get(c, m)
+    return hits, alignments, comparisons
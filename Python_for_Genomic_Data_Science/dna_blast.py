@@ -1,14 +1,29 @@
 # Runs blast (NCBI) on dna sequence
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 24 Oct 22
+#
+# python dna_blast.py               -> NCBIWWW.qblast against nt (network)
+# python dna_blast.py database.fa   -> local_blast against a local FASTA file (offline)
 
-from Bio.Blast import NCBIWWW, NCBIXML
+import os
+import sys
 
 # Insert sequence here
-result_handle = NCBIWWW.qblast("blastn", "nt", "tgggcctcatatttatcctatataccatgttcgtatggtggcgcgatgttctacgtgaatccacgttcgaaggacatcataccaaagtcgtacaattaggacctcgatatggttttattctgtttatcgtatcggaggttatgttcttttttgctctttttcgggcttcttctcattcttctttggcacctacggtagag")
-blast_record = NCBIXML.read(result_handle)
+sequence = "tgggcctcatatttatcctatataccatgttcgtatggtggcgcgatgttctacgtgaatccacgttcgaaggacatcataccaaagtcgtacaattaggacctcgatatggttttattctgtttatcgtatcggaggttatgttcttttttgctctttttcgggcttcttctcattcttctttggcacctacggtagag"
 
 # Modify e value if needed
 e_value_thresh = 0.01
+
+if len(sys.argv) > 1:
+    # local_blast reuses the FASTA reader of fasta_dna and the k-mer encoder of search_algorithms
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path += [os.path.join(here, 'fasta_dna'), os.path.join(here, '..', 'Algorithms_for_DNA_Sequencing')]
+    from local_blast import BlastDatabase, blast
+    blast_record = blast(sequence, BlastDatabase(sys.argv[1]), e_value_thresh)
+else:
+    from Bio.Blast import NCBIWWW, NCBIXML
+    result_handle = NCBIWWW.qblast("blastn", "nt", sequence)
+    blast_record = NCBIXML.read(result_handle)
+
 count = 0
 for alignment in blast_record.alignments:
     for hsp in alignment.hsps:
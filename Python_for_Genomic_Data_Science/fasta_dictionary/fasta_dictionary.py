@@ -13,6 +13,7 @@ while True:
         print("No such file in directory.")
 
 # Creates dictionay and stores values
+# Lines are collected in a list per record and joined once (no repeated string concatenation)
 sequences = {}
 for line in fileh:
     line = line.rstrip()
@@ -20,10 +21,12 @@ for line in fileh:
     if line.startswith(">"):
         words = line.split()
         name = words[0][1:]
-        sequences[name] = ""
+        sequences[name] = []
     # Adds sequence if line is not a header
     else:
-        sequences[name] = sequences[name] + line
+        sequences[name].append(line)
+for name, lines in sequences.items():
+    sequences[name] = "".join(lines)
 
 # Prints stored values
 for name, seq in sequences.items():
@@ -2,6 +2,12 @@
 # and computes the answers to the questions in 'instructions.txt'.
 # Sebastian Quirarte | sebastianquirajus@gmail.com | 22 Oct 22 
 
+# The ORF and repeat modules share the 2-bit base encoder of the
+# search_algorithms package (Algorithms for DNA Sequencing)
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Algorithms_for_DNA_Sequencing'))
+
 # Opens file
 while True:
     file = input("Enter file name: " )
@@ -13,107 +19,82 @@ while True:
     except:
         print("No such file in directory.")
 
-# Creates dictionay and stores values
-sequences = {}
-for line in fileh:
-    line = line.rstrip()
-    # Checks if line is header
-    if line.startswith(">"):
-        words = line.split()
-        name = words[0][1:]
-        sequences[name] = ""
-    # Adds sequence if line is not a header
-    else:
-        sequences[name] = sequences[name] + line
+# Indexes the file (name, length, byte offset and line layout of each record, saved as <file>.fai)
+# so sequences are fetched on demand instead of all being loaded into a dictionary
+from fasta_index import FastaIndex
+sequences = FastaIndex(file)
 
-sequences_length = {}
+# Record statistics in one streaming pass (no sequence kept in memory)
+from fasta_stats import fasta_stats
+stats = fasta_stats(file)
+sequences_length = dict(zip(stats.names, stats.lengths))
 
-# Prints names, secuences, and/or length
-for name, seq in sequences.items():
-    # Print name, full sequences and length
-    #print("\n" + name + "\n" + seq + "\nLength: " + str(len(seq)))
-    # Print name and length
-    #print("\n" + name + "\nLength: " + str(len(seq)))
-    # Adds values to list of lengths
-    sequences_length[name] = len(seq)
+# Prints names and/or length
+#for name, length in sequences_length.items():
+#    print("\n" + name + "\nLength: " + str(length))
 
-# Determines largest and smallest sequence
-largest = max(sequences_length.values())
-smallest = min(sequences_length.values())
-largest_name = list(sequences_length.keys())[list(sequences_length.values()).index(largest)]
-smallest_name = list(sequences_length.keys())[list(sequences_length.values()).index(smallest)]
+# Determines largest and smallest sequences, with all records tied for each
+largest, largest_names = stats.longest()
+smallest, smallest_names = stats.shortest()
 
 # Prints values and divison line
-print("\nSecuences: " + str(len(sequences)))
-print("Largest:",largest_name,"Count:",largest)
-print("Smallest:",smallest_name,"Count:",smallest,"\n\n______________________________________ORFs______________________________________\n")
+print("\nSecuences: " + str(len(stats)))
+print("Largest:",", ".join(largest_names),"Count:",largest)
+print("Smallest:",", ".join(smallest_names),"Count:",smallest)
+n50, l50 = stats.n50()
+print("N50:",n50,"L50:",l50)
+print("GC content: %.2f%%" % (100 * stats.gc_content()),"\n\n______________________________________ORFs______________________________________\n")
 
 #ORFs functions
-orfs1 = []
-orfs2 = []
-orfs3 = []
-all_orfs = []
+from orf_scanner import find_orfs
+
+# Longest and shortest ORF (length, record name, start) per reading frame and over all frames
+longest_orfs = {}
+shortest_orfs = {}
 
-def find_orf(sequence, n):
+def find_orf(name, sequence, n):
     print("--READING FRAME " + str(n) + "--")
-    # Finds start and stop codon indexes
-    start_index = []
-    stop_index = []
-    for i in range(n-1, len(sequence), 3):
-        if sequence[i:i+3] == "ATG":
-            start_index.append(i)
-        if sequence[i:i+3] in ["TAA", "TAG", "TGA"]:
-            stop_index.append(i+3)
-    # Finds ORFs
-    orfs = []
-    position = []
-    marker = 0
-    for i in range(0, len(start_index)):
-        for j in range (0, len(stop_index)):
-            if start_index[i] < stop_index[j] and start_index[i] > marker:
-                orfs.append(sequence[start_index[i]:stop_index[j]])
-                all_orfs.append(sequence[start_index[i]:stop_index[j]])
-                position.append(start_index[i])
-                mark = stop_index[j] + 3
-                if n == 1:
-                    orfs1.append(sequence[start_index[i]:stop_index[j]])
-                elif n == 2:
-                    orfs2.append(sequence[start_index[i]:stop_index[j]])
-                elif n == 3:
-                    orfs3.append(sequence[start_index[i]:stop_index[j]])
-                break
-    try:
-        longest_index = (orfs.index(max(orfs, key=len)))
-        shortest_index = (orfs.index(min(orfs, key=len)))
-    except:
-        pass
-    orfs.sort(key=len)
-    try:
-        print("Longest ORF: " + str(len(orfs[-1])),"Index: " + str(position[longest_index] + 1))
-    except:
-        print("None")
-    try:
-        print("Shortest ORF: " + str(len(orfs[0])),"Index: " + str(position[smallest_index] + 1))
-    except:
+    # One pass over the frame; ORFs are (start, end) coordinates, not substrings
+    longest = shortest = None
+    for orf in find_orfs(sequence, name, frames=(n,)):
+        length = orf.end - orf.start
+        if longest is None or length > longest[0]:
+            longest = (length, orf.start)
+        if shortest is None or length < shortest[0]:
+            shortest = (length, orf.start)
+    if longest is None:
         print("None")
+        return
+    print("Longest ORF: " + str(longest[0]),"Index: " + str(longest[1] + 1))
+    print("Shortest ORF: " + str(shortest[0]),"Index: " + str(shortest[1] + 1))
+    for frame in (n, "all"):
+        if frame not in longest_orfs or longest[0] > longest_orfs[frame][0]:
+            longest_orfs[frame] = (longest[0], name, longest[1] + 1)
+        if frame not in shortest_orfs or shortest[0] < shortest_orfs[frame][0]:
+            shortest_orfs[frame] = (shortest[0], name, shortest[1] + 1)
 
 # Finds ORFs
 for key, sequence in sequences.items():
     print(key)
-    find_orf(sequence,1)
-    find_orf(sequence,2)
-    find_orf(sequence,3)
-
-# Sorts ORFs
-all_orfs.sort(key=len)
-orfs1.sort(key=len)
-orfs2.sort(key=len)
-orfs3.sort(key=len)
+    find_orf(key, sequence,1)
+    find_orf(key, sequence,2)
+    find_orf(key, sequence,3)
 
 # Prints longest and shortest from all ORFs and reading frames
-print("-----ALL ORFS-----\n" + "Longest:",str(len(all_orfs[-1])),"\nShortest:",str(len(all_orfs[0])))
-print("-----READING FRAME 1-----\n" + "Longest:",str(len(orfs1[-1])),"\nShortest:",str(len(orfs1[0])))
-print("-----READING FRAME 2-----\n" + "Longest:",str(len(orfs2[-1])),"\nShortest:",str(len(orfs2[0])))
-print("-----READING FRAME 3-----\n" + "Longest:",str(len(orfs3[-1])),"\nShortest:",str(len(orfs3[0])))
+print("-----ALL ORFS-----\n" + "Longest:",str(longest_orfs["all"][0]),"\nShortest:",str(shortest_orfs["all"][0]))
+print("-----READING FRAME 1-----\n" + "Longest:",str(longest_orfs[1][0]),"\nShortest:",str(shortest_orfs[1][0]))
+print("-----READING FRAME 2-----\n" + "Longest:",str(longest_orfs[2][0]),"\nShortest:",str(shortest_orfs[2][0]))
+print("-----READING FRAME 3-----\n" + "Longest:",str(longest_orfs[3][0]),"\nShortest:",str(shortest_orfs[3][0]))
+
+# Repeats of a given length n (overlapping, forward strand, across all records)
+from repeats import count_repeats
+n = input("\nEnter repeat length (blank to skip): ")
+if n != "":
+    repeat_counts = count_repeats(file, int(n))
+    count, most_frequent = repeat_counts.most_frequent()
+    print("-----REPEATS OF LENGTH " + n + "-----")
+    print("Repeats:",sum(1 for _ in repeat_counts.repeats()))
+    print("Most frequent:",", ".join(most_frequent),"Count:",count)
 
+sequences.close()
 fileh.close()
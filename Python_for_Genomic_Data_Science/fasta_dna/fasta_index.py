@@ -0,0 +1,123 @@
+# Random access to the records of a multi-FASTA file through a samtools-style .fai index and mmap
+# Part of Genomic Data Science Specialization - Python for Genomic Data Science by Johns Hopkins University through Coursera
+
+import mmap
+import os
+from collections import namedtuple
+
+# One .fai line: record name, number of bases, byte offset of its first
+# base, bases per sequence line and bytes per line (newline included)
+FaiEntry = namedtuple('FaiEntry', 'name length offset line_bases line_width')
+
+def build_fai(filename):
+    """ Return the FaiEntry of every record, read in one streaming pass.
+        All sequence lines of a record but the last must have the same
+        length, as random access depends on it. """
+    entries = []
+    name = None
+    with open(filename, 'rb') as f:
+        pos = 0  # byte offset of the current line
+        for line in f:
+            if line.startswith(b'>'):
+                if name is not None:
+                    entries.append(FaiEntry(name, length, offset, line_bases, line_width))
+                words = line[1:].split()
+                name = words[0].decode() if words else ''
+                length = line_bases = line_width = 0
+                offset = pos + len(line)
+                short_line = False  # a line shorter than line_bases was seen
+            elif name is not None:
+                bases = len(line.rstrip(b'\r\n'))
+                newline = len(line) - bases  # 0 on a last line without one
+                if bases:
+                    if short_line or (line_bases and (bases > line_bases or (newline and newline != line_width - line_bases))):
+                        raise ValueError("%s: record %s has sequence lines of different lengths" % (filename, name))
+                    if not line_bases:
+                        line_bases, line_width = bases, bases + (newline or 1)
+                    elif bases < line_bases:
+                        short_line = True
+                    length += bases
+                else:
+                    short_line = True  # blank line: only allowed at the end of the record, no sequence may follow
+            pos += len(line)
+    if name is not None:
+        entries.append(FaiEntry(name, length, offset, line_bases, line_width))
+    return entries
+
+def write_fai(entries, path):
+    with open(path, 'w') as f:
+        for e in entries:
+            f.write("%s\t%d\t%d\t%d\t%d\n" % e)
+
+def read_fai(path):
+    entries = []
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            entries.append(FaiEntry(fields[0], *map(int, fields[1:5])))
+    return entries
+
+class FastaIndex(object):
+    """ Multi-FASTA file opened through its .fai index: fetching a record or
+        a subrange maps the file and slices only the bytes it covers, so
+        the file is never loaded as a whole. The index is built and saved
+        as <file>.fai the first time, or when the FASTA file is newer. """
+
+    def __init__(self, filename):
+        self.filename = filename
+        fai = filename + '.fai'
+        if os.path.exists(fai) and os.path.getmtime(fai) >= os.path.getmtime(filename):
+            self.entries = read_fai(fai)
+        else:
+            self.entries = build_fai(filename)
+            try:
+                write_fai(self.entries, fai)
+            except OSError:
+                pass  # read-only location: keep the index in memory only
+        self.by_name = {e.name: e for e in self.entries}
+        self._f = open(filename, 'rb')
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self.entries else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    @property
+    def names(self):
+        return [e.name for e in self.entries]
+
+    def length(self, name):
+        return self.by_name[name].length
+
+    def fetch(self, name, start=0, end=None):
+        """ Return bases start..end-1 (0-based) of a record as a str """
+        e = self.by_name[name]
+        end = e.length if end is None else min(end, e.length)
+        start = max(0, start)
+        if start >= end:
+            return ''
+        first = e.offset + start // e.line_bases * e.line_width + start % e.line_bases
+        last = e.offset + (end - 1) // e.line_bases * e.line_width + (end - 1) % e.line_bases
+        return self._mm[first:last+1].translate(None, b'\r\n').decode()
+
+    def __getitem__(self, name):
+        return self.fetch(name)
+
+    def items(self):
+        """ Yield (name, sequence) pairs in file order, one record at a time """
+        for e in self.entries:
+            yield e.name, self.fetch(e.name)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
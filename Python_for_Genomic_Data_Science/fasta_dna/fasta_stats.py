@@ -0,0 +1,130 @@
+# Single-pass record statistics for multi-FASTA files (counts, lengths with ties, N50/L50, GC) without loading sequences
+# Part of Genomic Data Science Specialization - Python for Genomic Data Science by Johns Hopkins University through Coursera
+
+import mmap
+import os
+from multiprocessing import Pool
+
+GC = b'GCgc'
+ACGT = b'ACGTacgt'
+
+class FastaStats(object):
+    """ Lengths of the records of a multi-FASTA file, in file order, and
+        base counts for the GC content """
+
+    def __init__(self, names=None, lengths=None, gc=0, acgt=0):
+        self.names = names if names is not None else []
+        self.lengths = lengths if lengths is not None else []
+        self.gc = gc  # G and C bases
+        self.acgt = acgt  # A, C, G and T bases (the rest are N or ambiguity codes)
+
+    def __len__(self):
+        return len(self.names)
+
+    def merge(self, other):
+        """ Append the statistics of the following part of the file """
+        self.names.extend(other.names)
+        self.lengths.extend(other.lengths)
+        self.gc += other.gc
+        self.acgt += other.acgt
+        return self
+
+    def total(self):
+        return sum(self.lengths)
+
+    def longest(self):
+        """ Return (length, names of every record with that length) """
+        return self._ties(max(self.lengths)) if self.lengths else (0, [])
+
+    def shortest(self):
+        return self._ties(min(self.lengths)) if self.lengths else (0, [])
+
+    def _ties(self, length):
+        return length, [name for name, l in zip(self.names, self.lengths) if l == length]
+
+    def n50(self):
+        """ Return (N50, L50): the length of the record that takes the
+            running sum of the lengths, longest first, to half the total,
+            and the number of records summed up to it """
+        half = self.total() / 2
+        running = 0
+        for count, length in enumerate(sorted(self.lengths, reverse=True), 1):
+            running += length
+            if running >= half:
+                return length, count
+        return 0, 0
+
+    def gc_content(self):
+        return self.gc / self.acgt if self.acgt else 0.0
+
+def split_ranges(filename, parts):
+    """ Split the file into up to parts byte ranges [start, end) that each
+        begin at a header line, or at 0 """
+    size = os.path.getsize(filename)
+    if size == 0 or parts <= 1:
+        return [(0, size)]
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for i in range(1, parts):
+            pos = mm.find(b'\n>', max(size * i // parts - 1, bounds[-1]))
+            if pos == -1:
+                break
+            if pos + 1 > bounds[-1]:
+                bounds.append(pos + 1)
+    bounds.append(size)
+    return [(bounds[i], bounds[i+1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i+1]]
+
+def _range_stats(args):
+    """ Statistics of the records that start in bytes start..end-1 """
+    filename, start, end = args
+    stats = FastaStats()
+    length = None  # length of the current record, None before the first header
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if pos >= end:
+                break
+            pos += len(line)
+            if line.startswith(b'>'):
+                if length is not None:
+                    stats.lengths.append(length)
+                words = line[1:].split()
+                stats.names.append(words[0].decode() if words else '')
+                length = 0
+            elif length is not None:
+                line = line.rstrip()
+                length += len(line)
+                stats.gc += len(line) - len(line.translate(None, GC))
+                stats.acgt += len(line) - len(line.translate(None, ACGT))
+    if length is not None:
+        stats.lengths.append(length)
+    return stats
+
+def fasta_stats(filename, processes=1):
+    """ Compute the FastaStats of a multi-FASTA file in one streaming pass
+        that keeps no sequence in memory. With processes > 1 the file is
+        split at header lines into byte ranges scanned in parallel. """
+    ranges = split_ranges(filename, processes * 4 if processes > 1 else 1)
+    tasks = [(filename, start, end) for start, end in ranges]
+    if processes > 1:
+        with Pool(processes) as pool:
+            parts = pool.map(_range_stats, tasks)  # in file order
+    else:
+        parts = map(_range_stats, tasks)
+    stats = FastaStats()
+    for part in parts:
+        stats.merge(part)
+    return stats
+
+if __name__ == '__main__':
+    import sys
+    stats = fasta_stats(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    length, names = stats.longest()
+    print("Records:", len(stats))
+    print("Total length:", stats.total())
+    print("Longest:", length, ' '.join(names))
+    length, names = stats.shortest()
+    print("Shortest:", length, ' '.join(names))
+    print("N50: %d L50: %d" % stats.n50())
+    print("GC content: %.2f%%" % (100 * stats.gc_content()))
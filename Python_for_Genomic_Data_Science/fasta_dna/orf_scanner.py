@@ -0,0 +1,147 @@
+# Six-frame open reading frame (ORF) scanner for multi-FASTA files, vectorized with NumPy; reports coordinates, not substrings
+# Part of Genomic Data Science Specialization - Python for Genomic Data Science by Johns Hopkins University through Coursera
+
+from collections import namedtuple
+
+import numpy as np
+
+from search_algorithms.kmer_index import BASE_CODES  # base -> 0-3 for A, C, G, T (either case), 4 otherwise
+
+# One ORF: frame 1-3 on the forward strand (reading from index 0, 1, 2) or
+# -1 to -3 on the reverse strand (reading the reverse complement from index
+# 0, 1, 2). start/end are 0-based, end-exclusive forward-strand coordinates
+# and include the stop codon, so a forward ORF is sequence[start:end] and a
+# reverse one is the reverse complement of sequence[start:end].
+ORF = namedtuple('ORF', 'seq_id frame start end')
+
+FRAMES = (1, 2, 3, -1, -2, -3)
+WINDOW = 1 << 22  # codon positions handled per NumPy step
+
+def _codon(s):
+    return tuple(b'ACGT'.index(c) for c in s.encode())
+
+START = _codon('ATG')
+STOPS = [_codon(s) for s in ('TAA', 'TAG', 'TGA')]
+REVERSE_START = _codon('CAT')  # ATG read on the reverse strand
+REVERSE_STOPS = [_codon(s) for s in ('TTA', 'CTA', 'TCA')]
+
+def _positions(c, codons, offset):
+    """ Return the positions in c (offset added) where any of codons begins """
+    c0, c1, c2 = c[:-2], c[1:-1], c[2:]
+    mask = np.zeros(len(c) - 2, dtype=bool)
+    for x, y, z in codons:
+        mask |= (c0 == x) & (c1 == y) & (c2 == z)
+    return np.flatnonzero(mask) + offset
+
+def find_orfs(seq, seq_id=None, frames=FRAMES, nested=True, window=WINDOW):
+    """ Yield an ORF for every start codon followed, in the same frame, by
+        a stop codon (the ORF ends at the first one). With nested=False
+        only the longest ORF ending at each stop codon is reported. seq is
+        a str, bytes or buffer; each frame is walked once, in windows of
+        codon positions, with the start codons still waiting for a stop
+        (forward) and the last stop seen (reverse) carried between windows,
+        so the cost is linear in len(seq) plus the number of ORFs. """
+    if isinstance(seq, str):
+        seq = seq.encode()
+    bases = np.frombuffer(seq, dtype=np.uint8)
+    length = len(bases)
+    forward = [f for f in (1, 2, 3) if f in frames]
+    reverse = [f for f in (-1, -2, -3) if f in frames]
+    waiting = [np.zeros(0, dtype=np.int64) for _ in range(3)]  # forward starts without a stop yet
+    last_stop = [-1, -1, -1]  # last reverse-strand stop codon of each position class
+    pending = [None, None, None]  # reverse ORFs held back when nested=False
+    for lo in range(0, length - 2, window):
+        hi = min(lo + window, length - 2)  # codons starting at lo..hi-1
+        c = BASE_CODES[bases[lo:hi+2]]
+        if forward:
+            starts = _positions(c, [START], lo)
+            stops = _positions(c, STOPS, lo)
+            for r in range(3):
+                s = np.concatenate((waiting[r], starts[starts % 3 == r]))
+                e = stops[stops % 3 == r]
+                k = np.searchsorted(e, s)  # first stop after each start
+                done = k < len(e)
+                waiting[r] = s[~done]
+                if r + 1 not in forward:
+                    continue
+                s, k = s[done], k[done]
+                if not nested:  # starts are sorted: keep the first one per stop
+                    _, first = np.unique(k, return_index=True)
+                    s, k = s[first], k[first]
+                for start, end in zip(s.tolist(), (e[k] + 3).tolist()):
+                    yield ORF(seq_id, r + 1, start, end)
+        if reverse:
+            starts = _positions(c, [REVERSE_START], lo)
+            stops = _positions(c, REVERSE_STOPS, lo)
+            for r in range(3):
+                frame = -((length - 3 - r) % 3 + 1)
+                s = starts[starts % 3 == r]
+                e = stops[stops % 3 == r]
+                previous = -1 if len(e) == 0 else int(e[-1])
+                if frame in reverse and len(s):
+                    e = np.concatenate(([last_stop[r]], e))
+                    stop = e[np.searchsorted(e, s) - 1]  # nearest stop to the left
+                    keep = stop >= 0
+                    for start, end in zip(stop[keep].tolist(), (s[keep] + 3).tolist()):
+                        orf = ORF(seq_id, frame, start, end)
+                        if nested:
+                            yield orf
+                            continue
+                        # later windows can still hold a longer ORF for this
+                        # stop: keep the rightmost start until the stop changes
+                        if pending[r] is not None and pending[r].start != start:
+                            yield pending[r]
+                        pending[r] = orf
+                if previous != -1:
+                    last_stop[r] = previous
+    for orf in pending:
+        if orf is not None:
+            yield orf
+
+def iter_fasta(filename, description=False):
+    """ Yield (identifier, sequence bytes) for each record of a multi-FASTA
+        file, holding only the current record in memory; with description
+        the whole header line (without '>') replaces the identifier """
+    name = None
+    lines = []
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.startswith(b'>'):
+                if name is not None:
+                    yield name, b''.join(lines)
+                if description:
+                    name = line[1:].strip().decode()
+                else:
+                    words = line[1:].split()
+                    name = words[0].decode() if words else ''
+                lines = []
+            else:
+                lines.append(line.rstrip())
+    if name is not None:
+        yield name, b''.join(lines)
+
+def scan_fasta(filename, frames=FRAMES, nested=True, min_length=0):
+    """ Yield the ORFs (at least min_length bases long) of every record of
+        a multi-FASTA file """
+    for name, seq in iter_fasta(filename):
+        for orf in find_orfs(seq, name, frames, nested):
+            if orf.end - orf.start >= min_length:
+                yield orf
+
+if __name__ == '__main__':
+    import sys
+    import time
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'dna1.fasta'
+    start = time.perf_counter()
+    longest = {}  # frame -> longest ORF
+    count = 0
+    for orf in scan_fasta(filename):
+        count += 1
+        best = longest.get(orf.frame)
+        if best is None or orf.end - orf.start > best.end - best.start:
+            longest[orf.frame] = orf
+    print("%d ORFs in %.3f s" % (count, time.perf_counter() - start))
+    for frame in FRAMES:
+        if frame in longest:
+            orf = longest[frame]
+            print("Frame %2d longest: %d (%s, position %d)" % (frame, orf.end - orf.start, orf.seq_id, orf.start + 1))
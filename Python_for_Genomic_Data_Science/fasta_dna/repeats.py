@@ -0,0 +1,134 @@
+# Counts the repeats (k-mers occurring more than once) of a multi-FASTA file using 2-bit k-mer codes and NumPy
+# Part of Genomic Data Science Specialization - Python for Genomic Data Science by Johns Hopkins University through Coursera
+
+import numpy as np
+
+from orf_scanner import iter_fasta
+from search_algorithms.kmer_index import kmer_codes  # 2-bit codes, A=0 C=1 G=2 T=3, first base most significant
+
+WINDOW = 1 << 24  # k-mer positions encoded per NumPy step
+
+def encode_kmer(s):
+    code = 0
+    for c in s.upper():
+        code = (code << 2) | 'ACGT'.index(c)
+    return code
+
+def decode_kmer(code, k):
+    return ''.join('ACGT'[(int(code) >> (2 * (k - 1 - j))) & 3] for j in range(k))
+
+def _windows(seq, k, window=WINDOW):
+    """ Yield (offset, codes, valid) for consecutive stretches of k-mer
+        positions, so temporaries stay bounded on long records """
+    for lo in range(0, max(len(seq) - k + 1, 0), window):
+        codes, valid = kmer_codes(seq[lo:lo + window + k - 1], k)
+        yield lo, codes, valid
+
+class RepeatCounts(object):
+    """ Number of occurrences of every distinct k-mer, as a sorted array of
+        k-mer codes and a parallel array of counts. Added (code, count)
+        pairs are buffered and merged into the table in bulk once they
+        outnumber it, so each k-mer is re-sorted a logarithmic number of
+        times however many records it is added in. """
+
+    def __init__(self, k, codes=None, counts=None):
+        self.k = k
+        self._codes = codes if codes is not None else np.zeros(0, dtype=np.uint64)
+        self._counts = counts if counts is not None else np.zeros(0, dtype=np.int64)
+        self._buffer = []  # (codes, counts) pairs not merged yet
+        self._buffered = 0
+
+    def add(self, codes, counts=None):
+        """ Add codes (with their counts, or one occurrence each) to the totals """
+        if counts is None:
+            codes, counts = np.unique(codes, return_counts=True)
+        self._buffer.append((codes, counts))
+        self._buffered += len(codes)
+        if self._buffered > max(len(self._codes), 1 << 20):
+            self._merge()
+
+    def _merge(self):
+        """ Sort and reduce the table and the buffered pairs in one step """
+        if not self._buffer:
+            return
+        codes = np.concatenate([self._codes] + [c for c, _ in self._buffer])
+        counts = np.concatenate([self._counts] + [n for _, n in self._buffer])
+        self._buffer, self._buffered = [], 0
+        if len(codes) == 0:
+            return
+        order = np.argsort(codes)
+        codes, counts = codes[order], counts[order]
+        first = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))  # start of each run of equal codes
+        self._codes = codes[first]
+        self._counts = np.add.reduceat(counts, first).astype(np.int64)
+
+    @property
+    def codes(self):
+        self._merge()
+        return self._codes
+
+    @property
+    def counts(self):
+        self._merge()
+        return self._counts
+
+    def __len__(self):
+        return len(self.codes)
+
+    def count(self, kmer):
+        """ Return the number of occurrences of kmer """
+        code = np.uint64(encode_kmer(kmer))
+        i = np.searchsorted(self.codes, code)
+        return int(self.counts[i]) if i < len(self.codes) and self.codes[i] == code else 0
+
+    def repeats(self, min_count=2):
+        """ Yield (k-mer, count) for every k-mer occurring at least min_count times """
+        for i in np.flatnonzero(self.counts >= min_count).tolist():
+            yield decode_kmer(self.codes[i], self.k), int(self.counts[i])
+
+    def most_frequent(self):
+        """ Return (count, k-mers with that count); ties are all returned """
+        if len(self.counts) == 0:
+            return 0, []
+        best = self.counts.max()
+        return int(best), [decode_kmer(c, self.k) for c in self.codes[self.counts == best]]
+
+def count_repeats(filename, k):
+    """ Count every k-mer of every record of a multi-FASTA file, skipping
+        k-mers with N or other ambiguous bases. Records are read one at a
+        time and their k-mers reduced to (code, count) pairs before being
+        merged, so memory grows with the number of distinct k-mers, plus
+        one window of the current record. """
+    totals = RepeatCounts(k)
+    for _, seq in iter_fasta(filename):
+        for _, codes, valid in _windows(seq, k):
+            totals.add(codes[valid])
+    return totals
+
+def repeat_positions(filename, kmers):
+    """ Return {k-mer: [(record name, 0-based position), ...]} for the
+        given k-mers, all of the same length """
+    kmers = list(kmers)
+    k = len(kmers[0])
+    wanted = np.array(sorted(encode_kmer(s) for s in kmers), dtype=np.uint64)
+    positions = {s.upper(): [] for s in kmers}
+    for name, seq in iter_fasta(filename):
+        for lo, codes, valid in _windows(seq, k):
+            hits = np.flatnonzero(valid & np.isin(codes, wanted))
+            for i, code in zip(hits.tolist(), codes[hits].tolist()):
+                positions[decode_kmer(code, k)].append((name, lo + i))
+    return positions
+
+if __name__ == '__main__':
+    import sys
+    import time
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'dna1.fasta'
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    start = time.perf_counter()
+    counts = count_repeats(filename, k)
+    elapsed = time.perf_counter() - start
+    count, kmers = counts.most_frequent()
+    print("%d distinct %d-mers, %d repeats, in %.3f s" % (len(counts), k, sum(1 for _ in counts.repeats()), elapsed))
+    print("Most frequent (%d times): %s" % (count, ' '.join(kmers)))
+    for kmer, where in repeat_positions(filename, kmers).items():
+        print(kmer, ' '.join('%s:%d' % w for w in where[:10]), '...' if len(where) > 10 else '')
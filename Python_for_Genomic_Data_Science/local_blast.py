@@ -0,0 +1,269 @@
+# Local blastn-style search: word seeds from a k-mer index of a FASTA database, X-drop ungapped then gapped extension
+# Part of Genomic Data Science Specialization - Python for Genomic Data Science by Johns Hopkins University through Coursera
+
+import bisect
+import math
+from collections import namedtuple
+
+import numpy as np
+
+# Shared with the FASTA tools; fasta_dna and the search_algorithms package
+# must be importable (dna_blast.py sets the path up)
+from orf_scanner import iter_fasta
+from search_algorithms.kmer_index import kmer_codes
+
+# Hits carry the fields dna_blast.py reads from Biopython's NCBIXML records
+BlastRecord = namedtuple('BlastRecord', 'query alignments')
+Alignment = namedtuple('Alignment', 'title length hsps')
+HSP = namedtuple('HSP', 'score bits expect identities align_length strand '
+                        'query_start query_end sbjct_start sbjct_end query match sbjct')
+
+# blastn defaults (reward 2, penalty -3, gap open 5, gap extend 2, word 11)
+# and the matching Karlin-Altschul lambda and K from NCBI BLAST's tables
+REWARD, PENALTY, GAP_OPEN, GAP_EXTEND = 2, -3, 5, 2
+KARLIN_UNGAPPED = {(2, -3): (0.55, 0.21)}
+KARLIN_GAPPED = {(2, -3, 5, 2): (0.625, 0.41)}
+
+COMPLEMENT = str.maketrans('ACGTN-', 'TGCAN-')
+
+class BlastDatabase(object):
+    """ FASTA database with a word index: the records are concatenated
+        (separated by N, so no word spans two of them) and the start of
+        every word is kept in an array sorted by word code """
+
+    def __init__(self, filename, word_size=11):
+        assert 0 < word_size <= 32
+        records = [(title, seq.decode().upper()) for title, seq in iter_fasta(filename, description=True)]
+        self.word_size = word_size
+        self.titles = [title for title, _ in records]
+        self.lengths = [len(seq) for _, seq in records]
+        self.starts = []  # offset of each record in seq
+        pos = 0
+        for length in self.lengths:
+            self.starts.append(pos)
+            pos += length + 1
+        self.seq = 'N'.join(seq for _, seq in records)
+        codes, valid = kmer_codes(self.seq, word_size)
+        positions = np.flatnonzero(valid)
+        order = np.argsort(codes[positions], kind='stable')
+        self.positions = positions[order]
+        self.codes = codes[self.positions]
+
+    def __len__(self):
+        return sum(self.lengths)  # letters in the database, for e-values
+
+    def lookup(self, codes):
+        """ Return (query word index, database position) pairs for an array
+            of word codes """
+        lo = np.searchsorted(self.codes, codes, side='left')
+        hi = np.searchsorted(self.codes, codes, side='right')
+        counts = hi - lo
+        words = np.repeat(np.arange(len(codes)), counts)
+        rank = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)  # index within each range
+        return words, self.positions[np.repeat(lo, counts) + rank]
+
+    def record(self, pos):
+        """ Return the record holding database position pos """
+        return bisect.bisect_right(self.starts, pos) - 1
+
+def _ungapped(q, s, qi, si, w, x_drop, lo, hi):
+    """ Extend the word match q[qi:qi+w] == s[si:si+w] both ways without
+        gaps, staying within s[lo:hi], until the score falls x_drop below
+        the best. Returns (score, query start, query end) """
+    score = best = w * REWARD
+    qe = qi + w
+    i, j = qe, si + w
+    while i < len(q) and j < hi:
+        score += REWARD if q[i] == s[j] else PENALTY
+        i += 1
+        j += 1
+        if score > best:
+            best, qe = score, i
+        elif best - score > x_drop:
+            break
+    score = best
+    qs = qi
+    i, j = qi - 1, si - 1
+    while i >= 0 and j >= lo:
+        score += REWARD if q[i] == s[j] else PENALTY
+        if score > best:
+            best, qs = score, i
+        elif best - score > x_drop:
+            break
+        i -= 1
+        j -= 1
+    return best, qs, qe
+
+def _gapped(q, s, x_drop, band):
+    """ Best-scoring alignment of a prefix of q with a prefix of s under
+        affine gaps (cost GAP_OPEN + GAP_EXTEND per gap letter), computed in
+        a band of diagonals with X-drop pruning. Returns (score, query
+        letters used, subject letters used, operations), an operation being
+        'M' (aligned pair), 'I' (query letter against a gap) or 'D' """
+    neg = float('-inf')
+    m, n = len(q), min(len(s), len(q) + band)
+    w = 2 * band + 1  # cell (i, j) is stored at column j - i + band
+    H = [[neg] * w for _ in range(m + 1)]  # best score ending at (i, j)
+    E = [[neg] * w for _ in range(m + 1)]  # ... ending with a gap in the query
+    F = [[neg] * w for _ in range(m + 1)]  # ... ending with a gap in the subject
+    TH = [bytearray(w) for _ in range(m + 1)]  # 0 diagonal, 1 from E, 2 from F
+    TE = [bytearray(w) for _ in range(m + 1)]  # 0 gap opened, 1 extended
+    TF = [bytearray(w) for _ in range(m + 1)]
+    H[0][band] = 0
+    for j in range(1, min(n, band) + 1):
+        if GAP_OPEN + GAP_EXTEND * j > x_drop:
+            break
+        H[0][band + j] = E[0][band + j] = -(GAP_OPEN + GAP_EXTEND * j)
+        TH[0][band + j] = 1
+        TE[0][band + j] = 1 if j > 1 else 0
+    best, bi, bj = 0, 0, 0
+    for i in range(1, m + 1):
+        alive = False
+        Hp, Fp, Hi, Ei, Fi = H[i-1], F[i-1], H[i], E[i], F[i]
+        for j in range(max(0, i - band), min(n, i + band) + 1):
+            k = j - i + band
+            if k + 1 < w:
+                f_open, f_ext = Hp[k+1] - GAP_OPEN - GAP_EXTEND, Fp[k+1] - GAP_EXTEND
+                Fi[k], TF[i][k] = (f_ext, 1) if f_ext > f_open else (f_open, 0)
+            if j > 0 and k > 0:
+                e_open, e_ext = Hi[k-1] - GAP_OPEN - GAP_EXTEND, Ei[k-1] - GAP_EXTEND
+                Ei[k], TE[i][k] = (e_ext, 1) if e_ext > e_open else (e_open, 0)
+            h, t = neg, 0
+            if j > 0:
+                h = Hp[k] + (REWARD if q[i-1] == s[j-1] else PENALTY)
+            if Ei[k] > h:
+                h, t = Ei[k], 1
+            if Fi[k] > h:
+                h, t = Fi[k], 2
+            if h < best - x_drop:
+                Hi[k] = Ei[k] = Fi[k] = neg
+                continue
+            Hi[k], TH[i][k] = h, t
+            alive = True
+            if h > best:
+                best, bi, bj = h, i, j
+        if not alive:
+            break
+    ops = []
+    i, j, state = bi, bj, 0
+    while i > 0 or j > 0:
+        k = j - i + band
+        if state == 0:
+            t = TH[i][k]
+            if t == 0:
+                ops.append('M')
+                i -= 1
+                j -= 1
+            else:
+                state = t
+        elif state == 1:
+            ops.append('D')
+            state = 1 if TE[i][k] else 0
+            j -= 1
+        else:
+            ops.append('I')
+            state = 2 if TF[i][k] else 0
+            i -= 1
+    ops.reverse()
+    return int(best), bi, bj, ops
+
+def _hsp_lines(q, s, ops):
+    """ Return the query, match and subject lines of an alignment """
+    query, match, sbjct = [], [], []
+    i = j = 0
+    for op in ops:
+        a = q[i] if op != 'D' else '-'
+        b = s[j] if op != 'I' else '-'
+        i += op != 'D'
+        j += op != 'I'
+        query.append(a)
+        sbjct.append(b)
+        match.append('|' if a == b else ' ')
+    return ''.join(query), ''.join(match), ''.join(sbjct)
+
+def bit_score(score, gapped=True):
+    lam, k = KARLIN_GAPPED[REWARD, PENALTY, GAP_OPEN, GAP_EXTEND] if gapped else KARLIN_UNGAPPED[REWARD, PENALTY]
+    return (lam * score - math.log(k)) / math.log(2)
+
+def blast(query, db, e_value=10.0, ungapped_x_drop=20, gapped_x_drop=30, trigger_bits=22.0, band=32):
+    """ Search both strands of query (str) against db (BlastDatabase) and
+        return a BlastRecord whose alignments (one per database record with
+        hits, best e-value first) hold the HSPs with expect <= e_value.
+        X-drops and the gapped-extension trigger follow blastn's defaults
+        (20 and 30 bits are about 25 and 33 raw; the trigger is in bits).
+        The e-value is K*m*n*exp(-lambda*S) with the raw query and database
+        lengths, without BLAST's edge-effect length adjustment. """
+    lam_u, k_u = KARLIN_UNGAPPED[REWARD, PENALTY]
+    lam, k = KARLIN_GAPPED[REWARD, PENALTY, GAP_OPEN, GAP_EXTEND]
+    trigger = (trigger_bits * math.log(2) + math.log(k_u)) / lam_u
+    ungapped_x = ungapped_x_drop * math.log(2) / lam_u
+    gapped_x = gapped_x_drop * math.log(2) / lam
+    query = query.upper()
+    search_space = len(query) * len(db)
+    w = db.word_size
+    hits = {}  # record -> HSPs
+    for strand in ('Plus', 'Minus'):
+        q = query if strand == 'Plus' else query.translate(COMPLEMENT)[::-1]
+        codes, valid = kmer_codes(q, w)
+        qpos = np.flatnonzero(valid)
+        words, spos = db.lookup(codes[qpos])
+        qpos = qpos[words]
+        order = np.lexsort((spos, spos - qpos))  # by diagonal, then position
+        reached = {}  # diagonal -> subject position extended up to
+        found = []  # (query start, query end, subject start, subject end) of gapped HSPs
+        for qi, si in zip(qpos[order].tolist(), spos[order].tolist()):
+            diag = si - qi
+            if si < reached.get(diag, -1):
+                continue
+            if any(qs <= qi < qe and ss <= si < se for qs, qe, ss, se in found):
+                continue
+            r = db.record(si)
+            start, length = db.starts[r], db.lengths[r]
+            score, uqs, uqe = _ungapped(q, db.seq, qi, si, w, ungapped_x, start, start + length)
+            reached[diag] = uqe + diag
+            if score < trigger:
+                continue
+            qc = (uqs + uqe) // 2
+            sc = qc + diag
+            lo = max(start, sc - qc - band)
+            hi = min(start + length, sc + len(q) - qc + band)
+            right = _gapped(q[qc:], db.seq[sc:hi], gapped_x, band)
+            left = _gapped(q[:qc][::-1], db.seq[lo:sc][::-1], gapped_x, band)
+            score = left[0] + right[0]
+            expect = search_space * k * math.exp(-lam * score)
+            qs, qe = qc - left[1], qc + right[1]
+            ss, se = sc - left[2], sc + right[2]
+            found.append((qs, qe, ss, se))
+            if expect > e_value:
+                continue
+            q_line, m_line, s_line = _hsp_lines(q[qs:qe], db.seq[ss:se], left[3][::-1] + right[3])
+            identities = m_line.count('|')
+            if strand == 'Plus':
+                coords = (qs + 1, qe, ss - start + 1, se - start)
+            else:  # shown BLAST-style: query on the plus strand, subject on the minus
+                q_line, s_line = q_line.translate(COMPLEMENT)[::-1], s_line.translate(COMPLEMENT)[::-1]
+                m_line = m_line[::-1]
+                coords = (len(q) - qe + 1, len(q) - qs, se - start, ss - start + 1)
+            hits.setdefault(r, []).append(HSP(score, bit_score(score), expect, identities, len(m_line),
+                                              ('Plus', strand), *coords, q_line, m_line, s_line))
+    alignments = []
+    for r, hsps in hits.items():
+        hsps.sort(key=lambda h: (h.expect, -h.score))
+        alignments.append(Alignment(db.titles[r], db.lengths[r], hsps))
+    alignments.sort(key=lambda a: (a.hsps[0].expect, -a.hsps[0].score))
+    return BlastRecord(query, alignments)
+
+if __name__ == '__main__':
+    # Bulk search, with fasta_dna and ../Algorithms_for_DNA_Sequencing on PYTHONPATH:
+    #     python local_blast.py database.fasta queries.fasta [e-value]
+    import sys
+    db = BlastDatabase(sys.argv[1])
+    e_value_thresh = float(sys.argv[3]) if len(sys.argv) > 3 else 0.01
+    for title, seq in iter_fasta(sys.argv[2], description=True):
+        record = blast(seq.decode().upper(), db, e_value_thresh)
+        for alignment in record.alignments:
+            for hsp in alignment.hsps:
+                print("%s\t%s\t%.1f%%\t%d\t%d\t%d\t%d\t%d\t%.2g\t%.1f" % (
+                    title.split()[0], alignment.title.split()[0], 100.0 * hsp.identities / hsp.align_length,
+                    hsp.align_length, hsp.query_start, hsp.query_end, hsp.sbjct_start, hsp.sbjct_end,
+                    hsp.expect, hsp.bits))